@@ -1,6 +1,6 @@
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 class OAuthException(Exception):
     def __init__(
@@ -22,6 +22,8 @@ class AppException(Exception):
         status_code: int = 400,
         headers: dict | None = None,
     ):
+        # str(exc) is what MCP puts in a tool error, so it carries the message
+        super().__init__(message)
         self.message = message
         self.status_code = status_code
         self.headers = headers or {}
@@ -36,7 +38,7 @@ def attach_exception_handlers(app: FastAPI):
         if exc.description:
             body["error_description"] = exc.description
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=exc.status_code,
             content=body,
             headers=exc.headers,
@@ -44,7 +46,7 @@ def attach_exception_handlers(app: FastAPI):
 
     @app.exception_handler(AppException)
     async def app_exception_handler(request: Request, exc: AppException):
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=exc.status_code,
             content={
                 "status": False,
@@ -55,7 +57,7 @@ def attach_exception_handlers(app: FastAPI):
 
     @app.exception_handler(Exception)
     async def unhandled_exception_handler(request: Request, exc: Exception):
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
                 "status": False,
@@ -66,23 +68,28 @@ def attach_exception_handlers(app: FastAPI):
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(request: Request, exc: RequestValidationError):
         messages = []
+        # dedupe while iterating, preserving first-seen order
+        seen = set()
 
         for err in exc.errors():
-            loc = err.get("loc", [])
-            err_type = err.get("type", "")
+            loc = err.get("loc", ())
 
-            where = loc[0] if len(loc) > 0 else "request"
-            field = loc[-1] if len(loc) > 1 else "field"
+            key = (
+                err.get("type", "") == "missing",
+                loc[0] if len(loc) > 0 else "request",
+                loc[-1] if len(loc) > 1 else "field",
+            )
+            if key in seen:
+                continue
+            seen.add(key)
 
-            if err_type == "missing":
+            missing, where, field = key
+            if missing:
                 messages.append(f"missing field '{field}' in {where}")
             else:
                 messages.append(f"invalid field '{field}' in {where}")
 
-        # remove duplicates while preserving order
-        messages = list(dict.fromkeys(messages))
-
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=400,
             content={
                 "status": False,
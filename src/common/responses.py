@@ -1,11 +1,15 @@
-from typing import Optional, Any
-from pydantic import BaseModel
+from dataclasses import dataclass
+from typing import Optional, Any, Dict
 
 
-class AppResponse(BaseModel):
+@dataclass(frozen=True, slots=True)
+class AppResponse:
     """
     Standardized response model for all application services.
 
+    Services build these from trusted data on every tool call, so this is
+    a slotted dataclass rather than a validating Pydantic model.
+
     Attributes:
         status (bool): Indicates whether the operation succeeded.
         message (str): Human-readable success or error message.
@@ -14,3 +18,11 @@ class AppResponse(BaseModel):
     status: bool
     message: str
     data: Optional[Any] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict form returned by the MCP tools."""
+        return {
+            "status": self.status,
+            "message": self.message,
+            "data": self.data,
+        }
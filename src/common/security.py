@@ -55,17 +55,17 @@ def verify_pkce(code_verifier: str, stored_code_challenge: str) -> bool:
         stored_code_challenge: The S256 code challenge value stored during the
             authorization request.
 
-    Raises:
-        Exception: If the computed challenge does not match the stored
-            code_challenge, indicating PKCE verification failure.
+    Returns:
+        bool: True if the verifier matches the stored challenge.
     """
 
-    computed_challenge: str = (
-        base64.urlsafe_b64encode(
-            hashlib.sha256(code_verifier.encode("ascii")).digest()
-        )
-        .rstrip(b"=")
-        .decode("ascii")
-    )
+    # Compare raw bytes so neither side has to be ASCII-only for
+    # compare_digest; a missing or non-ASCII verifier simply doesn't match
+    computed_challenge: bytes = base64.urlsafe_b64encode(
+        hashlib.sha256((code_verifier or "").encode("utf-8")).digest()
+    ).rstrip(b"=")
 
-    return hmac.compare_digest(computed_challenge, stored_code_challenge)
+    return hmac.compare_digest(
+        computed_challenge,
+        (stored_code_challenge or "").encode("utf-8"),
+    )
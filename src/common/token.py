@@ -1,11 +1,29 @@
-from datetime import datetime, timedelta, timezone
-from typing import Dict, Any, Optional
+import base64
+import hashlib
+import hmac
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
 
 import jwt
+import orjson
 
 from src.common.exceptions import AppException
 from src.core.config import settings
 
+# Verified claims keyed by (digest of token, expected_type). An entry is only
+# served while the token's own "exp" lies in the future, so a hit never
+# extends the lifetime of a token; it just skips the signature check and
+# claim parsing. Keys are 16-byte blake2b digests, so the cache neither
+# retains bearer tokens nor grows with their length. Least recently used
+# entries are evicted once the cache is full.
+_VERIFIED_CACHE_MAX: int = 2048
+_verified_cache: "OrderedDict[Tuple[bytes, str], Dict[str, Any]]" = OrderedDict()
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
 
 class JWTService:
     """
@@ -22,6 +40,24 @@ class JWTService:
     ISSUER: str = settings.JWT_ISSUER
     ALGORITHM: str = settings.JWT_ALGORITHM
 
+    # Built once so jwt.encode/decode don't re-encode the key or get fresh
+    # argument containers on every call.
+    _SECRET_BYTES: bytes = SECRET.encode()
+    _ALGORITHMS: Tuple[str, ...] = (ALGORITHM,)
+    _DECODE_OPTIONS: Dict[str, Any] = {"require": ["exp", "iat", "typ"]}
+
+    # HMAC algorithms are signed directly (precomputed header segment,
+    # orjson payload, hmac digest) instead of through PyJWT's algorithm
+    # dispatch and stdlib json. Anything else goes through jwt.encode.
+    _HMAC_DIGEST = {
+        "HS256": hashlib.sha256,
+        "HS384": hashlib.sha384,
+        "HS512": hashlib.sha512,
+    }.get(ALGORITHM)
+    _HEADER_SEGMENT: bytes = base64.urlsafe_b64encode(
+        orjson.dumps({"alg": ALGORITHM, "typ": "JWT"})
+    ).rstrip(b"=")
+
     DEFAULT_ACCESS_TTL: int = settings.JWT_ACCESS_TTL
     DEFAULT_REFRESH_TTL: int = settings.JWT_REFRESH_TTL
 
@@ -29,29 +65,6 @@ class JWTService:
     # Internal helpers
     # ------------------------------------------------------------------
 
-    @staticmethod
-    def _utc_now() -> datetime:
-        """
-        Get the current UTC time.
-
-        Returns:
-            A timezone-aware datetime in UTC.
-        """
-        return datetime.now(timezone.utc)
-
-    @staticmethod
-    def _to_timestamp(dt: datetime) -> int:
-        """
-        Convert a datetime to a UNIX timestamp.
-
-        Args:
-            dt: A timezone-aware datetime.
-
-        Returns:
-            Integer UNIX timestamp.
-        """
-        return int(dt.timestamp())
-
     def _encode_token(
         self,
         payload: Dict[str, Any],
@@ -69,22 +82,46 @@ class JWTService:
         Returns:
             A signed JWT string.
         """
-        now: datetime = self._utc_now()
+        iat: int = int(time.time())
 
         claims: Dict[str, Any] = {
             **payload,
             "iss": self.ISSUER,
-            "iat": self._to_timestamp(now),
-            "exp": self._to_timestamp(now + timedelta(seconds=ttl_seconds)),
+            "iat": iat,
+            "exp": iat + ttl_seconds,
             "typ": token_type,
         }
 
+        if self._HMAC_DIGEST is not None:
+            return self._sign_hmac(claims)
+
         return jwt.encode(
             claims,
-            self.SECRET,
+            self._SECRET_BYTES,
             algorithm=self.ALGORITHM,
         )
 
+    def _sign_hmac(self, claims: Dict[str, Any]) -> str:
+        """
+        Build a compact HS* JWT without going through PyJWT.
+
+        Args:
+            claims: The full claim set to sign.
+
+        Returns:
+            A signed JWT string, verifiable by jwt.decode.
+        """
+        signing_input = (
+            self._HEADER_SEGMENT
+            + b"."
+            + base64.urlsafe_b64encode(orjson.dumps(claims)).rstrip(b"=")
+        )
+        signature = hmac.new(self._SECRET_BYTES, signing_input, self._HMAC_DIGEST).digest()
+
+        return (
+            signing_input + b"." + base64.urlsafe_b64encode(signature).rstrip(b"=")
+        ).decode("ascii")
+
     def _decode_token(
         self,
         token: str,
@@ -105,18 +142,43 @@ class JWTService:
             jwt.InvalidTokenError: If the token is malformed or invalid.
             ValueError: If the token type does not match the expected type.
         """
+        cache_key = (_token_digest(token), expected_type)
+        cached = _verified_cache.get(cache_key)
+        if cached is not None:
+            if cached["exp"] > time.time():
+                _verified_cache.move_to_end(cache_key)
+                return dict(cached)
+            # expired: fall through so jwt.decode raises ExpiredSignatureError
+            del _verified_cache[cache_key]
+
         claims: Dict[str, Any] = jwt.decode(
             token,
-            self.SECRET,
-            algorithms=[self.ALGORITHM],
+            self._SECRET_BYTES,
+            algorithms=self._ALGORITHMS,
             issuer=self.ISSUER,
-            options={"require": ["exp", "iat", "typ"]},
+            options=self._DECODE_OPTIONS,
         )
 
         if claims.get("typ") != expected_type:
             raise ValueError("Invalid token type")
 
-        return claims
+        self._cache_claims(cache_key, claims)
+        return dict(claims)
+
+    @staticmethod
+    def _cache_claims(cache_key: Tuple[bytes, str], claims: Dict[str, Any]) -> None:
+        """
+        Remember verified claims until the token expires.
+
+        Args:
+            cache_key: (token digest, expected_type) pair the claims belong to.
+            claims: The verified JWT payload.
+        """
+        _verified_cache[cache_key] = claims
+        _verified_cache.move_to_end(cache_key)
+
+        while len(_verified_cache) > _VERIFIED_CACHE_MAX:
+            _verified_cache.popitem(last=False)
 
     # ------------------------------------------------------------------
     # Public API
@@ -218,6 +280,18 @@ class JWTService:
                 "WWW-Authenticate": 'Bearer error="invalid_token"'
             })
 
+    def forget_refresh_token(self, token: str) -> None:
+        """
+        Drop a refresh token's cached verification.
+
+        Called once the token has been rotated, so a replay goes back through
+        full verification instead of being served from the cache.
+
+        Args:
+            token: The JWT refresh token.
+        """
+        _verified_cache.pop((_token_digest(token), "refresh"), None)
+
     def refresh_access_token(
         self,
         refresh_token: str,
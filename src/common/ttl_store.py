@@ -0,0 +1,297 @@
+import asyncio
+import heapq
+import time
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import orjson
+
+from src.core.config import settings
+
+_MISSING = object()
+
+
+class TTLDict(dict):
+    """
+    In-memory dict whose entries expire.
+
+    Entries written with set() carry a TTL. Expired entries are never
+    returned by get/pop/[]/in, and are reclaimed either lazily on access or
+    in bulk by purge_expired(), which the sweep() task runs periodically.
+    Expiry times live in a min-heap, so a purge only touches entries that
+    are actually due.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        # Deadlines are integer monotonic_ns values: immune to wall-clock
+        # jumps and compared without float boxing.
+        self._expires_at: Dict[Hashable, int] = {}
+        self._heap: List[Tuple[int, Hashable]] = []
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """
+        Store a value that expires after ttl seconds.
+
+        Args:
+            key: Entry key.
+            value: Entry value.
+            ttl: Lifetime in seconds.
+        """
+        expires_at = time.monotonic_ns() + int(ttl * 1_000_000_000)
+        super().__setitem__(key, value)
+        self._expires_at[key] = expires_at
+        heapq.heappush(self._heap, (expires_at, key))
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        # plain assignment stores without expiry
+        self._expires_at.pop(key, None)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: Hashable) -> None:
+        self._expires_at.pop(key, None)
+        super().__delitem__(key)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _expired(self, key: Hashable) -> bool:
+        expires_at = self._expires_at.get(key)
+        if expires_at is None or expires_at > time.monotonic_ns():
+            return False
+        del self[key]
+        return True
+
+    def __getitem__(self, key: Hashable) -> Any:
+        if self._expired(key):
+            raise KeyError(key)
+        return super().__getitem__(key)
+
+    def __contains__(self, key: object) -> bool:
+        return super().__contains__(key) and not self._expired(key)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if self._expired(key):
+            return default
+        return super().get(key, default)
+
+    def pop(self, key: Hashable, default: Any = _MISSING) -> Any:
+        if self._expired(key):
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+
+        self._expires_at.pop(key, None)
+        if default is _MISSING:
+            return super().pop(key)
+        return super().pop(key, default)
+
+    def replace(self, key: Hashable, value: Any) -> None:
+        """Overwrite a value while keeping the entry's current expiry."""
+        super().__setitem__(key, value)
+
+    # ------------------------------------------------------------------
+    # Expiry
+    # ------------------------------------------------------------------
+
+    def purge_expired(self) -> int:
+        """
+        Drop every entry whose TTL has elapsed.
+
+        Returns:
+            The number of entries removed.
+        """
+        now = time.monotonic_ns()
+        removed = 0
+
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._heap)
+            # skip heap records left behind by overwrites and deletes
+            if self._expires_at.get(key) == expires_at:
+                del self[key]
+                removed += 1
+
+        return removed
+
+    async def sweep(self, interval: float = 30.0) -> None:
+        """Purge expired entries every interval seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            self.purge_expired()
+
+
+class MemoryStore:
+    """
+    Per-process store for JSON-like records, backed by a TTLDict.
+
+    Same async interface as RedisStore so call sites don't care which
+    backend is configured.
+    """
+
+    def __init__(self) -> None:
+        self._data = TTLDict()
+
+    async def get(self, key: str) -> Optional[dict]:
+        return self._data.get(key)
+
+    async def set(self, key: str, value: dict, ttl: int) -> None:
+        self._data.set(key, value, ttl)
+
+    async def update(self, key: str, value: dict) -> None:
+        self._data.replace(key, value)
+
+    async def pop(self, key: str) -> Optional[dict]:
+        return self._data.pop(key, None)
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def rename(self, old_key: str, new_key: str, value: dict, ttl: int) -> None:
+        # new entry first, so a concurrent reader never sees neither key
+        self._data.set(new_key, value, ttl)
+        self._data.pop(old_key, None)
+
+    async def acquire_lease(self, key: str, ttl: int) -> bool:
+        # single process: callers serialize with an asyncio.Lock already
+        return True
+
+    async def release_lease(self, key: str) -> None:
+        return None
+
+    async def sweep(self, interval: float = 30.0) -> None:
+        await self._data.sweep(interval)
+
+
+class RedisStore:
+    """
+    Store shared by all workers, kept in Redis with native expiry.
+
+    Records are orjson-encoded under "<namespace>:<key>".
+    """
+
+    def __init__(self, client: Any, namespace: str) -> None:
+        self._redis = client
+        self._prefix = f"{namespace}:"
+
+    async def get(self, key: str) -> Optional[dict]:
+        raw = await self._redis.get(self._prefix + key)
+        return orjson.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: dict, ttl: int) -> None:
+        await self._redis.set(self._prefix + key, orjson.dumps(value), ex=int(ttl))
+
+    async def update(self, key: str, value: dict) -> None:
+        # xx: never resurrect an entry that expired meanwhile
+        await self._redis.set(
+            self._prefix + key,
+            orjson.dumps(value),
+            keepttl=True,
+            xx=True,
+        )
+
+    async def pop(self, key: str) -> Optional[dict]:
+        # GETDEL is atomic, so a code can only be redeemed once across workers
+        raw = await self._redis.getdel(self._prefix + key)
+        return orjson.loads(raw) if raw is not None else None
+
+    async def delete(self, key: str) -> None:
+        await self._redis.delete(self._prefix + key)
+
+    async def rename(self, old_key: str, new_key: str, value: dict, ttl: int) -> None:
+        # MULTI/EXEC: other workers see either the old entry or the new one
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._prefix + new_key, orjson.dumps(value), ex=int(ttl))
+            pipe.delete(self._prefix + old_key)
+            await pipe.execute()
+
+    async def acquire_lease(self, key: str, ttl: int) -> bool:
+        """Claim key for ttl seconds across workers; False if already held."""
+        return bool(await self._redis.set(f"{self._prefix}lease:{key}", b"1", nx=True, ex=int(ttl)))
+
+    async def release_lease(self, key: str) -> None:
+        await self._redis.delete(f"{self._prefix}lease:{key}")
+
+    async def sweep(self, interval: float = 30.0) -> None:
+        # Redis expires keys itself
+        return None
+
+
+class RedisHashStore(RedisStore):
+    """
+    RedisStore variant that keeps each record as a Redis hash.
+
+    For flat records whose values are all strings: fields are stored as-is,
+    so there is no JSON envelope to encode or parse, and small hashes use
+    Redis' compact listpack encoding.
+    """
+
+    # HSET only while the key still exists, so update() never resurrects an
+    # expired record as a hash with no TTL
+    _UPDATE_IF_EXISTS = """
+    if redis.call('EXISTS', KEYS[1]) == 1 then
+        return redis.call('HSET', KEYS[1], unpack(ARGV))
+    end
+    return 0
+    """
+
+    def __init__(self, client: Any, namespace: str) -> None:
+        super().__init__(client, namespace)
+        self._update_script = client.register_script(self._UPDATE_IF_EXISTS)
+
+    @staticmethod
+    def _decode(raw: Dict[bytes, bytes]) -> Optional[dict]:
+        if not raw:
+            return None
+        return {k.decode(): v.decode() for k, v in raw.items()}
+
+    async def get(self, key: str) -> Optional[dict]:
+        return self._decode(await self._redis.hgetall(self._prefix + key))
+
+    async def set(self, key: str, value: dict, ttl: int) -> None:
+        name = self._prefix + key
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(name)
+            pipe.hset(name, mapping=value)
+            pipe.expire(name, int(ttl))
+            await pipe.execute()
+
+    async def update(self, key: str, value: dict) -> None:
+        args = [item for pair in value.items() for item in pair]
+        await self._update_script(keys=[self._prefix + key], args=args)
+
+    async def pop(self, key: str) -> Optional[dict]:
+        name = self._prefix + key
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hgetall(name)
+            pipe.delete(name)
+            raw, _ = await pipe.execute()
+        return self._decode(raw)
+
+    async def rename(self, old_key: str, new_key: str, value: dict, ttl: int) -> None:
+        name = self._prefix + new_key
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(name)
+            pipe.hset(name, mapping=value)
+            pipe.expire(name, int(ttl))
+            pipe.delete(self._prefix + old_key)
+            await pipe.execute()
+
+
+def create_store(namespace: str, as_hash: bool = False) -> "MemoryStore | RedisStore":
+    """
+    Redis-backed store when REDIS_URL is configured, in-memory otherwise.
+
+    as_hash picks RedisHashStore for namespaces whose records are flat
+    string maps; it has no effect on the in-memory backend.
+    """
+    if settings.REDIS_URL:
+        from src.core.redis import get_redis
+
+        store_cls = RedisHashStore if as_hash else RedisStore
+        return store_cls(get_redis(), namespace)
+
+    return MemoryStore()
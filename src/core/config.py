@@ -1,7 +1,9 @@
+from functools import cached_property
+
 from mcp.server.auth import settings
-from pydantic import AnyHttpUrl
+from pydantic import AnyHttpUrl, NonNegativeInt, PositiveInt
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import FrozenSet, List, Optional, Tuple
 
 
 class Settings(BaseSettings):
@@ -19,6 +21,14 @@ class Settings(BaseSettings):
     ALLOWED_HOSTS: str
     ALLOWED_ORIGINS: str
 
+    @cached_property
+    def ALLOWED_HOSTS_TUPLE(self) -> Tuple[str, ...]:
+        return tuple(host for host in (h.strip() for h in self.ALLOWED_HOSTS.split(",")) if host)
+
+    @cached_property
+    def ALLOWED_ORIGINS_TUPLE(self) -> Tuple[str, ...]:
+        return tuple(origin for origin in (o.strip() for o in self.ALLOWED_ORIGINS.split(",")) if origin)
+
     # ------------------------------------------------------------------
     # Spotify
     # ------------------------------------------------------------------
@@ -28,10 +38,18 @@ class Settings(BaseSettings):
     SPOTIFY_AUTH_URL: str = "https://accounts.spotify.com/authorize"
     SPOTIFY_TOKEN_URL: str = "https://accounts.spotify.com/api/token"
 
-    @property
+    @cached_property
     def SPOTIFY_REDIRECT_URI(self) -> str:
         return f"{self.BASE_URL}/callback/spotify"
 
+    # Return from pause/next/previous/volume before Spotify answers; a failed
+    # command is then reported by the user's next one
+    SPOTIFY_ASYNC_COMMANDS: bool = False
+
+    # Per-user cap on concurrent MCP tool calls, and how many more may queue
+    TOOL_CONCURRENCY_PER_USER: PositiveInt = 8
+    TOOL_BACKLOG_PER_USER: NonNegativeInt = 32
+
     # ------------------------------------------------------------------
     # OAuth Broker
     # ------------------------------------------------------------------
@@ -50,10 +68,14 @@ class Settings(BaseSettings):
         "user-read-playback-position"
     ]
 
-    @property
+    @cached_property
     def SUPPORTED_SCOPES_STR(self) -> str:
         return " ".join(self.SUPPORTED_SCOPES)
 
+    @cached_property
+    def SUPPORTED_SCOPES_SET(self) -> FrozenSet[str]:
+        return frozenset(self.SUPPORTED_SCOPES)
+
     TOKEN_BYTES: int = 32
     STATE_BYTES: int = 16
 
@@ -61,6 +83,21 @@ class Settings(BaseSettings):
     GRANT_TYPES_SUPPORTED: List[str] = ["authorization_code", "refresh_token"]
     CODE_CHALLENGE_METHODS_SUPPORTED: List[str] = ["S256"]
     TOKEN_ENDPOINT_AUTH_METHODS_SUPPORTED: List[str] = ["none"]
+
+    # Set views of the lists above for per-request membership checks; the
+    # lists themselves stay ordered for the metadata documents.
+    @cached_property
+    def RESPONSE_TYPES_SUPPORTED_SET(self) -> FrozenSet[str]:
+        return frozenset(self.RESPONSE_TYPES_SUPPORTED)
+
+    @cached_property
+    def GRANT_TYPES_SUPPORTED_SET(self) -> FrozenSet[str]:
+        return frozenset(self.GRANT_TYPES_SUPPORTED)
+
+    @cached_property
+    def CODE_CHALLENGE_METHODS_SUPPORTED_SET(self) -> FrozenSet[str]:
+        return frozenset(self.CODE_CHALLENGE_METHODS_SUPPORTED)
+
     TOKEN_ENDPOINT_AUTH_METHOD: str = "none"
     PKCE_REQUIRED: bool = True
 
@@ -68,7 +105,7 @@ class Settings(BaseSettings):
 
     # jwt
     JWT_SECRET: str
-    @property
+    @cached_property
     def JWT_ISSUER(self) -> str:
         return str(self.BASE_URL)
     JWT_ALGORITHM: str = "HS256"
@@ -86,6 +123,16 @@ class Settings(BaseSettings):
     # CORS
     # ------------------------------------------------------------------
     DATABASE_URL: str
+    SQL_ECHO: bool = False
+    DB_POOL_SIZE: int = 25
+    DB_MAX_OVERFLOW: int = 25
+    DB_POOL_RECYCLE: int = 1800 # 30 minutes
+
+    # ------------------------------------------------------------------
+    # Redis (optional; shared OAuth state across workers)
+    # ------------------------------------------------------------------
+    REDIS_URL: Optional[str] = None
+    REDIS_MAX_CONNECTIONS: int = 50
 
     # ------------------------------------------------------------------
     # Meta
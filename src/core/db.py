@@ -1,4 +1,11 @@
-from typing import AsyncGenerator
+import asyncio
+import hashlib
+from contextlib import suppress
+from typing import AsyncGenerator, Optional
+from sqlalchemy import JSON, Column, MetaData, String, Table, delete, event, insert, inspect, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -8,14 +15,46 @@ from sqlalchemy.orm import declarative_base
 
 from src.core.config import settings
 
+_url = make_url(settings.DATABASE_URL)
+_is_sqlite = _url.get_backend_name() == "sqlite"
+
+# In-memory SQLite gets a StaticPool (one shared connection), which rejects
+# QueuePool sizing arguments; every other URL gets a QueuePool.
+if _is_sqlite and (_url.database in (None, "", ":memory:") or _url.query.get("mode") == "memory"):
+    _pool_options = {}
+else:
+    _pool_options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        # LIFO reuses the most recently returned connection, so a few warm
+        # connections serve steady traffic and idle extras can be recycled
+        "pool_use_lifo": True,
+    }
+
 engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
+    _url,
+    echo=settings.SQL_ECHO,
     future=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
     pool_pre_ping=True,
+    query_cache_size=1200,
+    **_pool_options,
 )
 
 
+if _is_sqlite:
+
+    # WAL keeps commits atomic without rewriting the main db file on every
+    # write; synchronous=NORMAL is durable enough in WAL mode and skips an
+    # fsync per commit.
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
@@ -25,10 +64,138 @@ AsyncSessionLocal = async_sessionmaker(
 
 Base = declarative_base()
 
+# Bookkeeping table kept out of Base.metadata so it never feeds its own hash
+_schema_meta = Table(
+    "schema_meta",
+    MetaData(),
+    Column("k", String(32), primary_key=True),
+    Column("value", String(128), nullable=False),
+)
+
+
+def _schema_hash() -> str:
+    """Fingerprint of the declared tables and their columns."""
+    tables = sorted(
+        (
+            table.name,
+            # compiled for this dialect, so a type that only changes on one
+            # backend (e.g. a Postgres-only variant) still changes the hash
+            [
+                (c.name, c.type.compile(dialect=engine.dialect), c.nullable, c.primary_key)
+                for c in table.columns
+            ],
+        )
+        for table in Base.metadata.tables.values()
+    )
+    return hashlib.blake2b(repr(tables).encode(), digest_size=32).hexdigest()
+
+
+async def _stored_schema_hash() -> Optional[str]:
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                select(_schema_meta.c.value).where(_schema_meta.c.k == "hash")
+            )
+            return result.scalar_one_or_none()
+    except DBAPIError:
+        # first boot: schema_meta does not exist yet
+        return None
+
+
+def _create_missing_tables(sync_conn) -> None:
+    """
+    Create only the tables that don't exist yet.
+
+    One reflection query lists the existing tables, instead of create_all's
+    per-table existence check, and DDL is then issued without checkfirst.
+    """
+    inspector = inspect(sync_conn)
+    existing = set(inspector.get_table_names())
+
+    missing = [t for t in Base.metadata.sorted_tables if t.name not in existing]
+    if missing:
+        Base.metadata.create_all(sync_conn, tables=missing, checkfirst=False)
+
+    _upgrade_json_lists(sync_conn, inspector, existing)
+
+    if _schema_meta.name not in existing:
+        _schema_meta.create(sync_conn, checkfirst=False)
+
+
+def _upgrade_json_lists(sync_conn, inspector, existing: set) -> None:
+    """
+    Convert JSON list columns declared as native arrays on Postgres.
+
+    Tables created before those columns became ARRAY(String) on Postgres
+    still hold them as json/jsonb; create_all never alters existing tables,
+    so they are converted in place here. No-op on other dialects.
+    """
+    dialect = sync_conn.dialect
+    if dialect.name != "postgresql":
+        return
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing:
+            continue
+
+        reflected = {col["name"]: col["type"] for col in inspector.get_columns(table.name)}
+        for column in table.columns:
+            target = column.type.dialect_impl(dialect)
+            if isinstance(target, ARRAY) and isinstance(reflected.get(column.name), JSON):
+                _json_list_to_array(sync_conn, table.name, column)
+
+
+def _json_list_to_array(sync_conn, table_name: str, column) -> None:
+    # ALTER ... USING can't take a subquery, so the values are copied
+    # through a fresh column instead; runs inside init_db's transaction.
+    name = column.name
+    temp = f"{name}__array"
+    array_type = column.type.compile(dialect=sync_conn.dialect)
+
+    for statement in (
+        f'ALTER TABLE "{table_name}" ADD COLUMN "{temp}" {array_type}',
+        f'UPDATE "{table_name}" SET "{temp}" = '
+        f'ARRAY(SELECT json_array_elements_text("{name}"::json))',
+        f'ALTER TABLE "{table_name}" DROP COLUMN "{name}"',
+        f'ALTER TABLE "{table_name}" RENAME COLUMN "{temp}" TO "{name}"',
+    ):
+        sync_conn.exec_driver_sql(statement)
+
+    if not column.nullable:
+        sync_conn.exec_driver_sql(f'ALTER TABLE "{table_name}" ALTER COLUMN "{name}" SET NOT NULL')
+
 
 async def init_db() -> None:
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    schema_hash = _schema_hash()
+
+    # Skip DDL entirely when nothing changed
+    if await _stored_schema_hash() != schema_hash:
+        async with engine.begin() as conn:
+            await conn.run_sync(_create_missing_tables)
+            await conn.execute(delete(_schema_meta).where(_schema_meta.c.k == "hash"))
+            await conn.execute(insert(_schema_meta).values(k="hash", value=schema_hash))
+
+    await _prewarm_pool()
+
+
+async def _prewarm_pool() -> None:
+    """Open pool_size connections up front so early requests skip connect."""
+    if _is_sqlite:
+        # a local file (or memory): connecting costs no network round trip,
+        # and a burst of opens only contends on the file lock
+        return
+
+    conns = await asyncio.gather(
+        *(engine.connect() for _ in range(settings.DB_POOL_SIZE)),
+        return_exceptions=True,
+    )
+
+    for conn in conns:
+        if isinstance(conn, BaseException):
+            # best effort: a cold db must not fail startup
+            continue
+        with suppress(Exception):
+            await conn.close()
 
 
 async def close_db() -> None:
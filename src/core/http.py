@@ -0,0 +1,38 @@
+import httpx
+
+# Shared client: keeps connections to accounts.spotify.com / api.spotify.com
+# alive across requests instead of paying a TCP+TLS handshake on every call.
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+
+    if _http_client is None or _http_client.is_closed:
+        # HTTP/2 multiplexes concurrent tool calls over one TLS connection
+        # per Spotify host instead of opening a socket per in-flight request.
+        _http_client = httpx.AsyncClient(
+            # fail fast on connect/pool waits; Spotify reads get the full 10s
+            timeout=httpx.Timeout(10.0, connect=3.0, write=5.0, pool=5.0),
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(
+                    max_connections=50,
+                    max_keepalive_connections=50,
+                    # keep the connection warm across the pauses between
+                    # agent turns (httpx drops idle ones after 5s by default)
+                    keepalive_expiry=120.0,
+                ),
+            ),
+        )
+
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
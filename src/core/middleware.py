@@ -0,0 +1,164 @@
+from typing import Iterable, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+SAFELISTED_HEADERS = frozenset(
+    {"accept", "accept-language", "content-language", "content-type"}
+)
+
+
+class SecurityMiddleware:
+    """
+    Host validation and CORS in a single pure ASGI layer.
+
+    Replaces stacking TrustedHostMiddleware and CORSMiddleware, so each
+    request is inspected once instead of passing through two wrappers.
+    Passing allow_origins=None disables CORS and leaves only the host check.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allowed_hosts: Iterable[str],
+        allow_origins: Optional[Iterable[str]] = None,
+        allow_methods: Iterable[str] = ("GET",),
+        allow_headers: Iterable[str] = (),
+        max_age: int = 600,
+    ) -> None:
+        self.app = app
+
+        # --- hosts ---
+        hosts = list(allowed_hosts) or ["*"]
+        self.allow_any_host = "*" in hosts
+        self.exact_hosts = frozenset(h for h in hosts if not h.startswith("*"))
+        self.wildcard_suffixes = tuple(h[1:] for h in hosts if h.startswith("*."))
+
+        # --- CORS ---
+        self.cors_enabled = allow_origins is not None
+        origins = list(allow_origins or ())
+        methods = list(allow_methods)
+        headers = [h.lower() for h in allow_headers]
+
+        self.allow_all_origins = "*" in origins
+        self.allow_origins = frozenset(origins)
+        self.allow_all_methods = "*" in methods
+        self.allow_methods = frozenset(
+            ("DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT")
+            if self.allow_all_methods else methods
+        )
+        self.allow_all_headers = "*" in headers
+        self.allow_headers = SAFELISTED_HEADERS | frozenset(headers)
+
+        simple: List[tuple] = []
+        if self.allow_all_origins:
+            simple.append(("Access-Control-Allow-Origin", "*"))
+        self.simple_headers = simple
+
+        preflight: List[tuple] = []
+        if self.allow_all_origins:
+            preflight.append(("Access-Control-Allow-Origin", "*"))
+        else:
+            preflight.append(("Vary", "Origin"))
+        preflight.append(("Access-Control-Allow-Methods", ", ".join(sorted(self.allow_methods))))
+        preflight.append(("Access-Control-Max-Age", str(max_age)))
+        if self.allow_headers and not self.allow_all_headers:
+            preflight.append(("Access-Control-Allow-Headers", ", ".join(sorted(self.allow_headers))))
+        self.preflight_headers = preflight
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+
+        if not self._is_valid_host(headers.get("host", "").split(":")[0]):
+            response = PlainTextResponse("Invalid host header", status_code=400)
+            await response(scope, receive, send)
+            return
+
+        origin = headers.get("origin")
+        if not self.cors_enabled or origin is None or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and "access-control-request-method" in headers:
+            response = self._preflight_response(headers, origin)
+            await response(scope, receive, send)
+            return
+
+        await self._simple_response(scope, receive, send, origin, "cookie" in headers)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _is_valid_host(self, host: str) -> bool:
+        if self.allow_any_host or host in self.exact_hosts:
+            return True
+        return bool(self.wildcard_suffixes) and host.endswith(self.wildcard_suffixes)
+
+    def _is_allowed_origin(self, origin: str) -> bool:
+        return self.allow_all_origins or origin in self.allow_origins
+
+    def _preflight_response(self, request_headers: Headers, origin: str) -> PlainTextResponse:
+        requested_method = request_headers["access-control-request-method"]
+        requested_headers = request_headers.get("access-control-request-headers")
+
+        headers = dict(self.preflight_headers)
+        failures = []
+
+        if self._is_allowed_origin(origin):
+            if not self.allow_all_origins:
+                headers["Access-Control-Allow-Origin"] = origin
+        else:
+            failures.append("origin")
+
+        if requested_method not in self.allow_methods:
+            failures.append("method")
+
+        if self.allow_all_headers and requested_headers is not None:
+            headers["Access-Control-Allow-Headers"] = requested_headers
+        elif requested_headers is not None:
+            for header in (h.strip().lower() for h in requested_headers.split(",")):
+                if header and header not in self.allow_headers:
+                    failures.append("headers")
+                    break
+
+        if failures:
+            return PlainTextResponse(
+                "Disallowed CORS " + ", ".join(failures),
+                status_code=400,
+                headers=headers,
+            )
+
+        return PlainTextResponse("OK", status_code=200, headers=headers)
+
+    async def _simple_response(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        origin: str,
+        has_cookie: bool,
+    ) -> None:
+        explicit_origin = not self.allow_all_origins or has_cookie
+        if explicit_origin and not self._is_allowed_origin(origin):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if explicit_origin:
+                    # Echo the origin instead of "*" when it has to be explicit
+                    headers["Access-Control-Allow-Origin"] = origin
+                    headers.add_vary_header("Origin")
+                else:
+                    for key, value in self.simple_headers:
+                        headers[key] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
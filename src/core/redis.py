@@ -0,0 +1,29 @@
+from typing import Any
+
+from src.core.config import settings
+
+# Shared connection pool, created on first use. Only touched when REDIS_URL
+# is configured, so the redis package stays an optional dependency.
+_redis_client: Any = None
+
+
+def get_redis() -> Any:
+    global _redis_client
+
+    if _redis_client is None:
+        import redis.asyncio as redis
+
+        _redis_client = redis.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+        )
+
+    return _redis_client
+
+
+async def close_redis() -> None:
+    global _redis_client
+
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
@@ -1,56 +1,91 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.applications import Starlette
+from starlette.routing import Mount
 
 from src.common.exceptions import attach_exception_handlers
 from src.core.config import settings
 from src.routes.auth.auth_routes import router
+from src.services.auth.auth_services import AUTH_REQUESTS, SPOTIFY_TOKENS
 from src.spotify_mcp.server import mcp
+from src.spotify_mcp.services.spotify_services import DEFERRED_FAILURES
 from src.core.db import init_db, close_db
-from src.spotify_mcp.tools.spotify_tools import *
+from src.core.http import close_http_client, get_http_client
+from src.core.middleware import SecurityMiddleware
+from src.core.redis import close_redis
+from src.spotify_mcp.tools import spotify_tools  # noqa: F401  (registers MCP tools)
 
 
 # Lifespan
 @asynccontextmanager
-async def lifespan(app: FastAPI):
+async def lifespan(app: Starlette):
     # ---- Startup ----
     await init_db()
+    # Build the shared Spotify client up front rather than on the first tool
+    # call; services reach it through get_http_client()
+    get_http_client()
+    sweepers = [
+        asyncio.create_task(AUTH_REQUESTS.sweep()),
+        asyncio.create_task(SPOTIFY_TOKENS.sweep()),
+        asyncio.create_task(DEFERRED_FAILURES.sweep()),
+    ]
     yield
     # ---- Shutdown ----
+    for task in sweepers:
+        task.cancel()
+    await asyncio.gather(*sweepers, return_exceptions=True)
+    await close_http_client()
+    await close_redis()
     await close_db()
 
-# app
-app = FastAPI(
+# REST api (OAuth broker)
+api = FastAPI(
     title=settings.APP_NAME,
     debug=settings.DEBUG,
     openapi_url="/openapi.json" if settings.DEBUG else None,
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url=None,
-    lifespan=lifespan
+    default_response_class=ORJSONResponse,
 )
 
-# CORS
-app.add_middleware(
-    CORSMiddleware,
+# Allowed hosts + CORS (single ASGI layer)
+api.add_middleware(
+    SecurityMiddleware,
+    allowed_hosts=settings.ALLOWED_HOSTS_TUPLE,
     allow_origins=settings.CORS_ALLOW_ORIGINS,
     allow_methods=settings.CORS_ALLOW_METHODS,
     allow_headers=settings.CORS_ALLOW_HEADERS,
 )
 
-# Allowed hosts
-app.add_middleware(
-    TrustedHostMiddleware,
-    allowed_hosts=[host for host in settings.ALLOWED_HOSTS.split(",") if host],
-)
+# Compress larger JSON bodies (REST only; gzip would buffer the /mcp SSE stream)
+api.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 # 🚀 Mount router
-app.include_router(router)
+api.include_router(router)
 
 # Attach exception handlers
 
-attach_exception_handlers(app)
+attach_exception_handlers(api)
 
-# Mount MCP Server
-app.mount("/mcp", mcp.sse_app())
+# MCP Server: kept off the FastAPI stack so SSE traffic only pays for the
+# host/CORS check, not FastAPI's exception and dependency middleware
+mcp_app = SecurityMiddleware(
+    mcp.sse_app(),
+    allowed_hosts=settings.ALLOWED_HOSTS_TUPLE,
+    allow_origins=settings.CORS_ALLOW_ORIGINS,
+    allow_methods=settings.CORS_ALLOW_METHODS,
+    allow_headers=settings.CORS_ALLOW_HEADERS,
+)
+
+# app
+app = Starlette(
+    routes=[
+        Mount("/mcp", app=mcp_app),
+        Mount("", app=api),
+    ],
+    lifespan=lifespan,
+)
 
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, HttpUrl, field_validator, AnyHttpUrl, ConfigDict
-from typing import List, Optional
+from pydantic import AfterValidator, BaseModel, Field, HttpUrl, field_validator, AnyHttpUrl, ConfigDict
+from typing import Annotated, List, Optional
 
 from src.core.config import settings
 
@@ -31,9 +31,13 @@ class AuthorizationServerMetadata(BaseModel):
     pkce_required: bool = settings.PKCE_REQUIRED
 
 # ----- Client Registration -----
+# Validated as a URL, then kept in its string form: that is what gets
+# persisted and compared, so it is converted once here.
+RedirectUri = Annotated[AnyHttpUrl, AfterValidator(str)]
+
 class ClientRegistrationRequest(BaseModel):
     client_name: Optional[str] = None
-    redirect_uris: List[AnyHttpUrl]
+    redirect_uris: List[RedirectUri]
     grant_types: List[str]
     response_types: List[str]
     token_endpoint_auth_method: Optional[str] = "none"
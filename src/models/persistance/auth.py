@@ -1,22 +1,28 @@
+from functools import cached_property
+
 from sqlalchemy import (
     String,
     Integer,
     Text,
     JSON,
 )
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.core.db import Base
 
+# Portable JSON list; a native text[] on Postgres skips JSON decoding on read
+StringList = JSON().with_variant(ARRAY(String), "postgresql")
+
 
 class Client(Base):
     __tablename__ = "clients"
+    __mapper_args__ = {"eager_defaults": True}
 
     # OAuth identifiers
     client_id: Mapped[str] = mapped_column(
         String(64),
         primary_key=True,
-        index=True,
     )
 
     client_id_issued_at: Mapped[int] = mapped_column(
@@ -31,19 +37,19 @@ class Client(Base):
         default="",
     )
 
-    # ✅ SQLite-safe replacements
+    # ✅ SQLite-safe replacements (native arrays on Postgres)
     redirect_uris: Mapped[list[str]] = mapped_column(
-        JSON,
+        StringList,
         nullable=False,
     )
 
     grant_types: Mapped[list[str]] = mapped_column(
-        JSON,
+        StringList,
         nullable=False,
     )
 
     response_types: Mapped[list[str]] = mapped_column(
-        JSON,
+        StringList,
         nullable=False,
     )
 
@@ -57,3 +63,8 @@ class Client(Base):
         Text,
         nullable=True,
     )
+
+    @cached_property
+    def redirect_uri_set(self) -> frozenset[str]:
+        """Registered redirect URIs for O(1) membership checks (not mapped)."""
+        return frozenset(self.redirect_uris)
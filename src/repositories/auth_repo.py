@@ -1,8 +1,28 @@
-from sqlalchemy import select
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.db import AsyncSessionLocal
 from src.models.persistance.auth import Client
 
+# Clients don't change after registration, so lookups are served from memory
+# for a while. Cached rows are detached from their session; the least
+# recently used ones are evicted past CLIENT_CACHE_MAX.
+CLIENT_CACHE_TTL: int = 300 # 5 minutes
+CLIENT_CACHE_MAX: int = 4096
+_client_cache: "OrderedDict[str, Tuple[float, Client]]" = OrderedDict()
+
+
+# Built once; SQLAlchemy's compiled cache then keys on this same construct
+_CLIENT_BY_ID_STMT = select(Client).where(Client.client_id == bindparam("cid"))
+
+
+def invalidate_client(client_id: str) -> None:
+    _client_cache.pop(client_id, None)
+
 
 async def create_client(
     db: AsyncSession,
@@ -28,7 +48,7 @@ async def create_client(
 
     db.add(client)
     await db.commit()
-    await db.refresh(client)
+    invalidate_client(client_id)
     return client
 
 
@@ -36,6 +56,42 @@ async def get_client_by_id(
     db: AsyncSession,
     client_id: str,
 ) -> Client | None:
-    stmt = select(Client).where(Client.client_id == client_id)
-    result = await db.execute(stmt)
-    return result.scalar_one_or_none()
+    cached = _cached_client(client_id)
+    if cached is not None:
+        return cached
+
+    result = await db.execute(_CLIENT_BY_ID_STMT, {"cid": client_id})
+    client = result.scalar_one_or_none()
+
+    if client is not None:
+        db.expunge(client)
+        _client_cache[client_id] = (time.monotonic() + CLIENT_CACHE_TTL, client)
+        if len(_client_cache) > CLIENT_CACHE_MAX:
+            _client_cache.popitem(last=False)
+
+    return client
+
+
+async def get_client(client_id: str) -> Client | None:
+    """
+    Look up a client, opening a short-lived session only on a cache miss.
+    """
+    cached = _cached_client(client_id)
+    if cached is not None:
+        return cached
+
+    async with AsyncSessionLocal() as db:
+        return await get_client_by_id(db, client_id)
+
+
+def _cached_client(client_id: str) -> Client | None:
+    cached = _client_cache.get(client_id)
+    if cached is None:
+        return None
+
+    if cached[0] <= time.monotonic():
+        del _client_cache[client_id]
+        return None
+
+    _client_cache.move_to_end(client_id)
+    return cached[1]
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, Form, Depends
-from pydantic import HttpUrl
+from fastapi import APIRouter, Form, Depends, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.services.auth import auth_services
@@ -21,7 +21,7 @@ router = APIRouter()
 
 @router.get("/health", response_model=HealthResponse, include_in_schema=False)
 def health():
-    return auth_services.health()
+    return Response(auth_services.health(), media_type="application/json")
 
 
 @router.get(
@@ -29,7 +29,7 @@ def health():
     response_model=ProtectedResourceMetadata,
 )
 def protected_resource_metadata():
-    return auth_services.protected_resource_metadata()
+    return Response(auth_services.protected_resource_metadata(), media_type="application/json")
 
 
 @router.get(
@@ -37,7 +37,7 @@ def protected_resource_metadata():
     response_model=AuthorizationServerMetadata,
 )
 def authorization_server_metadata():
-    return auth_services.authorization_server_metadata()
+    return Response(auth_services.authorization_server_metadata(), media_type="application/json")
 
 # ---------------------------------------------------------------------------
 # Client registration
@@ -52,7 +52,7 @@ async def register_client(
     payload: ClientRegistrationRequest,
     db: AsyncSession = Depends(get_session),
 ):
-    return await auth_services.register_client(payload, db)
+    return ORJSONResponse(await auth_services.register_client(payload, db))
 
 # ---------------------------------------------------------------------------
 # Authorization
@@ -67,10 +67,8 @@ async def authorize(
     code_challenge_method: str,
     state: str = "",
     scope: str = "",
-    db: AsyncSession = Depends(get_session),
 ):
     return await auth_services.authorize(
-        db=db,
         response_type=response_type,
         client_id=client_id,
         redirect_uri=redirect_uri,
@@ -85,8 +83,8 @@ async def authorize(
 # ---------------------------------------------------------------------------
 
 @router.get("/callback/spotify")
-def spotify_callback(code: str, state: str):
-    return auth_services.spotify_callback(code, state)
+async def spotify_callback(code: str, state: str):
+    return await auth_services.spotify_callback(code, state)
 
 # ---------------------------------------------------------------------------
 # Token endpoint
@@ -97,17 +95,17 @@ async def token(
     grant_type: str = Form(...),
     client_id: str = Form(...),
     code: str = Form(None),
-    redirect_uri: HttpUrl = Form(None),
+    redirect_uri: str = Form(None),
     code_verifier: str = Form(None),
     refresh_token: str = Form(None),
-    db: AsyncSession = Depends(get_session),
 ):
-    return await auth_services.issue_token(
-        db=db,
+    # The service already returns the exact TokenResponse shape; encode it
+    # directly instead of re-validating it through the response model
+    return ORJSONResponse(await auth_services.issue_token(
         grant_type=grant_type,
         client_id=client_id,
         code=code,
         redirect_uri=redirect_uri,
         code_verifier=code_verifier,
         refresh_token=refresh_token,
-    )
+    ))
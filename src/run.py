@@ -1,3 +1,5 @@
+import sys
+
 import uvicorn
 from src.core.config import settings
 # from src.mcp_server import mcp
@@ -10,4 +12,6 @@ if __name__ == "__main__":
         reload=settings.DEBUG,
         proxy_headers=True,
         forwarded_allow_ips="*",
+        # uvloop is not available on Windows; fall back to the stdlib loop there
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
     )
@@ -1,52 +1,137 @@
+import asyncio
+import base64
 import secrets
 import time
-from typing import Dict, Optional
-from urllib.parse import urlencode
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from urllib.parse import quote_plus, urlencode
 
-import httpx
+import orjson
 from fastapi.responses import RedirectResponse
-from pydantic import HttpUrl
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.common.exceptions import OAuthException
 from src.common.token import JWTService
+from src.common.ttl_store import create_store
 from src.common.security import generate_pkce_pair, verify_pkce
 from src.core.config import settings
-from src.models.dto.auth_models import ClientRegistrationRequest
+from src.core.http import get_http_client
+from src.models.dto.auth_models import ClientRegistrationRequest, RedirectUri
 from src.repositories.auth_repo import (
     create_client,
-    get_client_by_id,
+    get_client,
 )
 
 # ---------------------------------------------------------------------------
-# In-memory stores (yes yes, Redis later)
+# OAuth state stores (in-memory, or Redis when REDIS_URL is set)
 # ---------------------------------------------------------------------------
 
-AUTH_REQUESTS: Dict[str, dict] = {}
-SPOTIFY_TOKENS: Dict[str, dict] = {}
+# Entries expire on their own. In memory, sweepers started in the app
+# lifespan reclaim abandoned ones; with REDIS_URL set, Redis expires them and
+# the state is shared by every worker.
+AUTH_REQUESTS = create_store("auth")
+SPOTIFY_TOKENS = create_store("tok", as_hash=True)
+
+# JWTService holds no per-instance state (key and algorithm are class
+# attributes), so one instance is shared by every grant.
+_JWT_SERVICE = JWTService()
+
+@lru_cache(maxsize=1)
+def _client_credentials() -> str:
+    """
+    Basic auth header value for the broker's Spotify app credentials.
+
+    Built once per process; the credentials never change at runtime.
+    """
+    raw = f"{settings.SPOTIFY_CLIENT_ID}:{settings.SPOTIFY_CLIENT_SECRET}"
+    return "Basic " + base64.b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+@lru_cache(maxsize=1)
+def _token_headers() -> dict[str, str]:
+    """
+    Headers for every POST to the Spotify token endpoint.
+
+    Shared by reference; httpx copies headers into the request and never
+    mutates the dict passed in.
+    """
+    return {
+        "Authorization": _client_credentials(),
+        "Content-Type": "application/x-www-form-urlencoded",
+    }
+
+@lru_cache(maxsize=1)
+def _code_grant_body_prefix() -> bytes:
+    """
+    Constant part of the form body for the authorization_code exchange.
+
+    The Spotify app credentials travel in the Basic auth header, so only the
+    per-request code and code_verifier are appended by the caller.
+    """
+    return urlencode({
+        "grant_type": "authorization_code",
+        "redirect_uri": settings.SPOTIFY_REDIRECT_URI,
+    }).encode()
+
+@lru_cache(maxsize=1)
+def _spotify_authorize_base() -> str:
+    """
+    Spotify authorize URL with the per-process constant query params encoded.
+
+    Per-request params (scope, state, PKCE challenge) are appended by the caller.
+    The broker's own PKCE pair is always S256, whatever method the client used.
+    """
+    params = {
+        "client_id": settings.SPOTIFY_CLIENT_ID,
+        "response_type": "code",
+        "redirect_uri": settings.SPOTIFY_REDIRECT_URI,
+        "code_challenge_method": "S256",
+    }
+    return f"{settings.SPOTIFY_AUTH_URL}?{urlencode(params)}"
+
+def _raise_if_invalid(errors: list[tuple[str, str]]) -> None:
+    """
+    Raise one OAuthException covering every failed check.
+
+    Callers run all their checks before calling this, so a rejected request
+    takes the same path whichever field tripped. The error code is the first
+    failure's; descriptions are joined.
+    """
+    if errors:
+        raise OAuthException(
+            error=errors[0][0],
+            description="; ".join(description for _, description in errors),
+        )
 
 # ---------------------------------------------------------------------------
 # Metadata / utility
 # ---------------------------------------------------------------------------
 
-def health():
-    return {
+# These documents only depend on settings, so each is serialized once and
+# the same JSON bytes are served on every request.
+
+@lru_cache(maxsize=1)
+def health() -> bytes:
+    return orjson.dumps({
         "status": "ok",
         "app": settings.APP_NAME,
         "env": settings.ENV,
-    }
+    })
 
 
-def protected_resource_metadata():
-    return {
+@lru_cache(maxsize=1)
+def protected_resource_metadata() -> bytes:
+    return orjson.dumps({
         "resource": f"{settings.BASE_URL}/mcp",
         "authorization_servers": [settings.BASE_URL],
         "scopes_supported": settings.SUPPORTED_SCOPES,
-    }
+    })
 
 
-def authorization_server_metadata():
-    return {
+@lru_cache(maxsize=1)
+def authorization_server_metadata() -> bytes:
+    return orjson.dumps({
         "issuer": settings.BASE_URL,
         "authorization_endpoint": f"{settings.BASE_URL}/authorize",
         "token_endpoint": f"{settings.BASE_URL}/token",
@@ -57,7 +142,7 @@ def authorization_server_metadata():
         "code_challenge_methods_supported": settings.CODE_CHALLENGE_METHODS_SUPPORTED,
         "token_endpoint_auth_methods_supported": settings.TOKEN_ENDPOINT_AUTH_METHODS_SUPPORTED,
         "pkce_required": settings.PKCE_REQUIRED,
-    }
+    })
 
 # ---------------------------------------------------------------------------
 # Client registration
@@ -67,40 +152,37 @@ async def register_client(
     payload: ClientRegistrationRequest,
     db: AsyncSession,
 ):
+    errors = []
+
     if not payload.redirect_uris:
-        raise OAuthException(
-            error="invalid_client_metadata",
-            description="Missing required field: redirect_uris",
-        )
+        errors.append(("invalid_client_metadata", "Missing required field: redirect_uris"))
 
-    unsupported_grants = set(payload.grant_types) - set(settings.GRANT_TYPES_SUPPORTED)
+    unsupported_grants = set(payload.grant_types).difference(settings.GRANT_TYPES_SUPPORTED_SET)
     if unsupported_grants:
-        raise OAuthException(
-            error="unsupported_grant_type",
-            description=f"Unsupported grant_type(s): {', '.join(unsupported_grants)}",
-        )
+        errors.append((
+            "unsupported_grant_type",
+            f"Unsupported grant_type(s): {', '.join(unsupported_grants)}",
+        ))
 
-    unsupported_responses = set(payload.response_types) - set(settings.RESPONSE_TYPES_SUPPORTED)
+    unsupported_responses = set(payload.response_types).difference(settings.RESPONSE_TYPES_SUPPORTED_SET)
     if unsupported_responses:
-        raise OAuthException(
-            error="unsupported_response_type",
-            description=f"Unsupported response_type(s): {', '.join(unsupported_responses)}",
-        )
+        errors.append((
+            "unsupported_response_type",
+            f"Unsupported response_type(s): {', '.join(unsupported_responses)}",
+        ))
 
     if payload.token_endpoint_auth_method != "none":
-        raise OAuthException(
-            error="invalid_client_metadata",
-            description="Only token_endpoint_auth_method=none is supported",
-        )
+        errors.append((
+            "invalid_client_metadata",
+            "Only token_endpoint_auth_method=none is supported",
+        ))
 
     if payload.scope:
-        requested = set(payload.scope.split())
-        unsupported = requested - set(settings.SUPPORTED_SCOPES)
+        unsupported = set(payload.scope.split()) - settings.SUPPORTED_SCOPES_SET
         if unsupported:
-            raise OAuthException(
-                error="invalid_scope",
-                description=f"Unsupported scope(s): {', '.join(unsupported)}",
-            )
+            errors.append(("invalid_scope", f"Unsupported scope(s): {', '.join(unsupported)}"))
+
+    _raise_if_invalid(errors)
 
     client_id = secrets.token_urlsafe(16)
     issued_at = int(time.time())
@@ -110,7 +192,7 @@ async def register_client(
         client_id=client_id,
         issued_at=issued_at,
         client_name=payload.client_name or "",
-        redirect_uris=[str(uri) for uri in payload.redirect_uris],
+        redirect_uris=payload.redirect_uris,
         grant_types=payload.grant_types,
         response_types=payload.response_types,
         scope=payload.scope,
@@ -131,8 +213,25 @@ async def register_client(
 # Authorization endpoint
 # ---------------------------------------------------------------------------
 
+_REDIRECT_URI = TypeAdapter(RedirectUri)
+
+
+@lru_cache(maxsize=1024)
+def _normalize_redirect_uri(uri: str) -> str | None:
+    """
+    uri in the form register_client persisted it, or None if it is not a URL.
+
+    Registered URIs go through AnyHttpUrl (trailing slash added, host
+    lowercased, default port dropped), so the raw /authorize value has to
+    be normalised the same way before it is compared.
+    """
+    try:
+        return _REDIRECT_URI.validate_python(uri)
+    except ValidationError:
+        return None
+
+
 async def authorize(
-    db: AsyncSession,
     response_type: str,
     client_id: str,
     redirect_uri: str,
@@ -141,94 +240,85 @@ async def authorize(
     code_challenge: str,
     code_challenge_method: str,
 ):
-    if response_type not in settings.RESPONSE_TYPES_SUPPORTED:
-        raise OAuthException(
-            error="unsupported_response_type",
-            description=f"Unsupported response_type: {response_type}",
-        )
+    errors = []
 
-    client = await get_client_by_id(db, client_id)
-    if not client:
-        raise OAuthException(
-            error="invalid_client",
-            description=f"Invalid client_id: {client_id}",
-        )
+    if response_type not in settings.RESPONSE_TYPES_SUPPORTED_SET:
+        errors.append(("unsupported_response_type", f"Unsupported response_type: {response_type}"))
 
     if not code_challenge:
-        raise OAuthException(
-            error="invalid_request",
-            description="Missing code_challenge",
-        )
+        errors.append(("invalid_request", "Missing code_challenge"))
+
+    if code_challenge_method not in settings.CODE_CHALLENGE_METHODS_SUPPORTED_SET:
+        errors.append(("invalid_request", f"Invalid code_challenge_method: {code_challenge_method}"))
+
+    # Deduplicated in the order the client sent them; a set round-trip would
+    # shuffle the scope string passed on to Spotify
+    requested_scopes = list(dict.fromkeys(scope.split())) if scope else []
+    if not requested_scopes:
+        errors.append(("invalid_scope", "Missing scope"))
+    else:
+        supported = settings.SUPPORTED_SCOPES_SET
+        unsupported = [name for name in requested_scopes if name not in supported]
+        if unsupported:
+            errors.append(("invalid_scope", f"Unsupported scope(s): {', '.join(unsupported)}"))
 
-    if code_challenge_method not in settings.CODE_CHALLENGE_METHODS_SUPPORTED:
-        raise OAuthException(
-            error="invalid_request",
-            description=f"Invalid code_challenge_method: {code_challenge_method}",
-        )
+    _raise_if_invalid(errors)
 
-    if not scope:
+    # Looked up only once the request itself is well-formed, so malformed
+    # requests never reach the DB. Short-lived session (if any).
+    client = await get_client(client_id)
+    if not client:
         raise OAuthException(
-            error="invalid_scope",
-            description="Missing scope",
+            error="invalid_client",
+            description=f"Invalid client_id: {client_id}",
         )
 
-    requested_scopes = set(scope.split())
-    unsupported = requested_scopes - set(settings.SUPPORTED_SCOPES)
-    if unsupported:
+    if _normalize_redirect_uri(redirect_uri) not in client.redirect_uri_set:
         raise OAuthException(
-            error="invalid_scope",
-            description=f"Unsupported scope(s): {', '.join(unsupported)}",
+            error="invalid_request",
+            description="redirect_uri is not registered for this client",
         )
 
     scope_str = " ".join(requested_scopes)
 
     auth_id = secrets.token_urlsafe(32)
-    AUTH_REQUESTS[auth_id] = {
-        "client_id": client_id,
-        "redirect_uri": redirect_uri,
-        "original_state": state,
-        "original_code_challenge": code_challenge,
-        "original_scope": scope_str,
-        "expires_at": time.time() + settings.AUTH_REQUEST_TTL,
-    }
-
     code_verifier, broker_challenge = generate_pkce_pair()
-    AUTH_REQUESTS[auth_id]["code_verifier"] = code_verifier
 
-    spotify_params = {
-        "client_id": settings.SPOTIFY_CLIENT_ID,
-        "response_type": "code",
-        "redirect_uri": str(settings.SPOTIFY_REDIRECT_URI),
-        "scope": scope_str,
-        "state": auth_id,
-        "code_challenge": broker_challenge,
-        "code_challenge_method": code_challenge_method,
-    }
+    await AUTH_REQUESTS.set(
+        auth_id,
+        {
+            "client_id": client_id,
+            "redirect_uri": redirect_uri,
+            "original_state": state,
+            "original_code_challenge": code_challenge,
+            "original_scope": scope_str,
+            "code_verifier": code_verifier,
+        },
+        ttl=settings.AUTH_REQUEST_TTL,
+    )
 
+    # Only scope needs escaping: auth_id and the challenge are base64url
     return RedirectResponse(
-        f"{settings.SPOTIFY_AUTH_URL}?{urlencode(spotify_params)}"
+        f"{_spotify_authorize_base()}"
+        f"&scope={quote_plus(scope_str)}"
+        f"&state={auth_id}"
+        f"&code_challenge={broker_challenge}"
     )
 
 # ---------------------------------------------------------------------------
 # Spotify callback
 # ---------------------------------------------------------------------------
 
-def spotify_callback(code: str, state: str):
-    auth = AUTH_REQUESTS.get(state)
+async def spotify_callback(code: str, state: str):
+    auth = await AUTH_REQUESTS.get(state)
     if not auth:
         raise OAuthException(
             error="invalid_request",
             description="Invalid or expired authorization request",
         )
 
-    if time.time() > auth["expires_at"]:
-        del AUTH_REQUESTS[state]
-        raise OAuthException(
-            error="invalid_request",
-            description="Authorization request expired",
-        )
-
     auth["code"] = code
+    await AUTH_REQUESTS.update(state, auth)
 
     params = {"code": state}
     if auth.get("original_state"):
@@ -243,45 +333,115 @@ def spotify_callback(code: str, state: str):
 # ---------------------------------------------------------------------------
 
 async def issue_token(
-    db: AsyncSession,
     grant_type: str,
     client_id: str,
-    code: Optional[str] = None,
-    redirect_uri: Optional[HttpUrl] = None,
-    code_verifier: Optional[str] = None,
-    refresh_token: Optional[str] = None,
+    code: str | None = None,
+    redirect_uri: str | None = None,
+    code_verifier: str | None = None,
+    refresh_token: str | None = None,
 ):
-    if grant_type not in settings.GRANT_TYPES_SUPPORTED:
+    handler = (
+        _GRANT_HANDLERS.get(grant_type)
+        if grant_type in settings.GRANT_TYPES_SUPPORTED_SET
+        else None
+    )
+    if handler is None:
         raise OAuthException(
             error="unsupported_grant_type",
             description=f"Invalid grant_type: {grant_type}",
         )
 
-    client = await get_client_by_id(db, client_id)
+    # Release the connection before the Spotify token exchange
+    client = await get_client(client_id)
     if not client:
         raise OAuthException(
             error="invalid_client",
             description=f"Unknown client_id: {client_id}",
         )
 
-    if grant_type == "authorization_code":
-        return await _code_grant(client_id, code, redirect_uri, code_verifier)
-    elif grant_type == "refresh_token":
-        return await _refresh_grant(client_id, refresh_token)
-
-    raise OAuthException(
-        error="unsupported_grant_type",
-        description=f"Unsupported grant_type: {grant_type}",
-    )
+    return await handler(client_id, code, redirect_uri, code_verifier, refresh_token)
 
 # ---------------------------------------------------------------------------
 # Grants
 # ---------------------------------------------------------------------------
 
+# token_id -> [lock, holders]; entries are dropped once nobody holds or
+# waits on them, so the dict only tracks refreshes in flight.
+_refresh_locks: dict[str, list] = {}
+
+
+@asynccontextmanager
+async def _single_flight(key: str):
+    """Serialize coroutines working on the same key (per process)."""
+    entry = _refresh_locks.get(key)
+    if entry is None:
+        entry = _refresh_locks[key] = [asyncio.Lock(), 0]
+
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if not entry[1]:
+            del _refresh_locks[key]
+
+
+# Upper bound on one refresh round trip; a crashed worker's lease lapses after it
+_REFRESH_LEASE_TTL: int = 10
+
+
+@asynccontextmanager
+async def _refresh_lease(token_id: str):
+    """
+    Hold the cross-worker refresh lease for token_id.
+
+    With Redis, a second worker refreshing the same token concurrently is
+    refused instead of sending a duplicate refresh to Spotify. In-memory
+    stores always grant it; _single_flight already covers one process.
+    """
+    if not await SPOTIFY_TOKENS.acquire_lease(token_id, ttl=_REFRESH_LEASE_TTL):
+        raise OAuthException(
+            error="invalid_grant",
+            description="Refresh token is already being redeemed",
+        )
+    try:
+        yield
+    finally:
+        await SPOTIFY_TOKENS.release_lease(token_id)
+
+
+async def _sign_token_pair(
+    token_service: JWTService,
+    token_id: str,
+    expires_in: int | None,
+) -> tuple[str, str]:
+    """
+    Sign the broker access/refresh pair for a stored Spotify token.
+
+    HMAC signing takes microseconds, cheaper than a thread hop, so it stays
+    inline. Asymmetric algorithms (RS/ES/PS) take milliseconds and are signed
+    on worker threads to keep the event loop free.
+    """
+    payload = {"token_id": token_id}
+
+    if settings.JWT_ALGORITHM.startswith("HS"):
+        return (
+            token_service.generate_access_token(payload, expires_in=expires_in),
+            token_service.generate_refresh_token(payload),
+        )
+
+    access_token, refresh_token = await asyncio.gather(
+        asyncio.to_thread(token_service.generate_access_token, payload, expires_in),
+        asyncio.to_thread(token_service.generate_refresh_token, payload),
+    )
+    return access_token, refresh_token
+
+
 async def _code_grant(
     client_id: str,
     code: str,
-    redirect_uri: HttpUrl,
+    redirect_uri: str,
     code_verifier: str,
 ):
     if not code or not redirect_uri or not code_verifier:
@@ -290,14 +450,14 @@ async def _code_grant(
             description="Missing required parameters",
         )
 
-    auth_req = AUTH_REQUESTS.pop(code, None)
+    auth_req = await AUTH_REQUESTS.pop(code)
     if not auth_req:
         raise OAuthException(
             error="invalid_grant",
             description="Invalid or expired authorization code",
         )
 
-    if str(redirect_uri) != auth_req["redirect_uri"]:
+    if redirect_uri != auth_req["redirect_uri"]:
         raise OAuthException(
             error="invalid_request",
             description="redirect_uri mismatch",
@@ -309,22 +469,20 @@ async def _code_grant(
             description="Code challenge mismatch",
         )
 
-    token_service = JWTService()
+    token_service = _JWT_SERVICE
     token_id = secrets.token_urlsafe(16)
 
-    async with httpx.AsyncClient(timeout=10) as client:
-        resp = await client.post(
-            settings.SPOTIFY_TOKEN_URL,
-            data={
-                "grant_type": "authorization_code",
-                "code": auth_req["code"],
-                "redirect_uri": str(settings.SPOTIFY_REDIRECT_URI),
-                "client_id": settings.SPOTIFY_CLIENT_ID,
-                "client_secret": settings.SPOTIFY_CLIENT_SECRET,
-                "code_verifier": auth_req["code_verifier"],
-            },
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
-        )
+    client = get_http_client()
+    resp = await client.post(
+        settings.SPOTIFY_TOKEN_URL,
+        # code_verifier is our own base64url token; only the code is escaped
+        content=(
+            _code_grant_body_prefix()
+            + b"&code=" + quote_plus(auth_req["code"]).encode()
+            + b"&code_verifier=" + auth_req["code_verifier"].encode()
+        ),
+        headers=_token_headers(),
+    )
 
     if resp.status_code != 200:
         raise OAuthException(
@@ -332,20 +490,23 @@ async def _code_grant(
             description="Spotify token retrieval failed",
         )
 
-    spotify_tokens = resp.json()
+    spotify_tokens = orjson.loads(resp.content)
 
-    access_token = token_service.generate_access_token(
-        {"token_id": token_id},
-        expires_in=spotify_tokens.get("expires_in"),
+    access_token, refresh_token = await _sign_token_pair(
+        token_service, token_id, spotify_tokens.get("expires_in")
     )
-    refresh_token = token_service.generate_refresh_token({"token_id": token_id})
 
-    SPOTIFY_TOKENS[token_id] = {
-        "client_id": client_id,
-        "access_token": spotify_tokens["access_token"],
-        "refresh_token": spotify_tokens["refresh_token"],
-        "scope": auth_req["original_scope"],
-    }
+    # Kept as long as the broker refresh token that points at it is valid
+    await SPOTIFY_TOKENS.set(
+        token_id,
+        {
+            "client_id": client_id,
+            "access_token": spotify_tokens["access_token"],
+            "refresh_token": spotify_tokens["refresh_token"],
+            "scope": auth_req["original_scope"],
+        },
+        ttl=settings.JWT_REFRESH_TTL,
+    )
 
     return {
         "access_token": access_token,
@@ -363,7 +524,7 @@ async def _refresh_grant(client_id: str, refresh_token: str):
             description="Missing refresh_token",
         )
 
-    token_service = JWTService()
+    token_service = _JWT_SERVICE
 
     try:
         token_data = token_service.verify_refresh_token(refresh_token)
@@ -374,58 +535,69 @@ async def _refresh_grant(client_id: str, refresh_token: str):
         )
 
     token_id = token_data["token_id"]
-    stored = SPOTIFY_TOKENS.get(token_id)
-    if not stored:
-        raise OAuthException(
-            error="invalid_grant",
-            description="Refresh token expired or revoked",
-        )
+    # Concurrent refreshes of the same token queue here; the first rotates it
+    # and the rest then find it gone, so Spotify sees one refresh per token.
+    async with _single_flight(token_id), _refresh_lease(token_id):
+        stored = await SPOTIFY_TOKENS.get(token_id)
+        if not stored:
+            raise OAuthException(
+                error="invalid_grant",
+                description="Refresh token expired or revoked",
+            )
 
-    if client_id != stored["client_id"]:
-        raise OAuthException(
-            error="invalid_client",
-            description="refresh_token does not belong to client",
-        )
+        if client_id != stored["client_id"]:
+            raise OAuthException(
+                error="invalid_client",
+                description="refresh_token does not belong to client",
+            )
 
-    async with httpx.AsyncClient(timeout=10) as client:
+        client = get_http_client()
         resp = await client.post(
             settings.SPOTIFY_TOKEN_URL,
-            data={
-                "grant_type": "refresh_token",
-                "refresh_token": stored["refresh_token"],
-                "client_id": settings.SPOTIFY_CLIENT_ID,
-                "client_secret": settings.SPOTIFY_CLIENT_SECRET,
-            },
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            content=(
+                b"grant_type=refresh_token&refresh_token="
+                + quote_plus(stored["refresh_token"]).encode()
+            ),
+            headers=_token_headers(),
         )
 
-    if resp.status_code != 200:
-        raise OAuthException(
-            error="server_error",
-            description="Spotify refresh failed",
-        )
+        if resp.status_code != 200:
+            raise OAuthException(
+                error="server_error",
+                description="Spotify refresh failed",
+            )
 
-    new_token = resp.json()
-    new_token_id = secrets.token_urlsafe(16)
+        new_token = orjson.loads(resp.content)
+        new_token_id = secrets.token_urlsafe(16)
 
-    access_token = token_service.generate_access_token(
-        {"token_id": new_token_id},
-        expires_in=new_token.get("expires_in"),
-    )
-    refresh_token = token_service.generate_refresh_token({"token_id": new_token_id})
+        access_token, new_refresh_token = await _sign_token_pair(
+            token_service, new_token_id, new_token.get("expires_in")
+        )
 
-    del SPOTIFY_TOKENS[token_id]
-    SPOTIFY_TOKENS[new_token_id] = {
-        "client_id": client_id,
-        "access_token": new_token["access_token"],
-        "refresh_token": new_token["refresh_token"],
-        "scope": stored["scope"],
-    }
+        # Rotate: the record moves to the new token_id in one step, which revokes
+        # the refresh token just presented. Spotify may omit refresh_token, in
+        # which case the current one stays valid.
+        stored["access_token"] = new_token["access_token"]
+        stored["refresh_token"] = new_token.get("refresh_token", stored["refresh_token"])
+        await SPOTIFY_TOKENS.rename(
+            token_id,
+            new_token_id,
+            stored,
+            ttl=settings.JWT_REFRESH_TTL,
+        )
+        token_service.forget_refresh_token(refresh_token)
 
     return {
         "access_token": access_token,
         "token_type": "bearer",
         "expires_in": new_token.get("expires_in"),
-        "refresh_token": refresh_token,
+        "refresh_token": new_refresh_token,
         "scope": stored["scope"],
     }
+
+
+# grant_type -> handler(client_id, code, redirect_uri, code_verifier, refresh_token)
+_GRANT_HANDLERS = {
+    "authorization_code": lambda cid, code, ru, cv, rt: _code_grant(cid, code, ru, cv),
+    "refresh_token": lambda cid, code, ru, cv, rt: _refresh_grant(cid, rt),
+}
@@ -17,7 +17,7 @@ mcp = FastMCP(
     ),
     transport_security=TransportSecuritySettings(
         enable_dns_rebinding_protection=True,
-        allowed_hosts=[host for host in settings.ALLOWED_HOSTS.split(",") if host],
-        allowed_origins=[origin for origin in settings.ALLOWED_ORIGINS.split(",") if origin],
+        allowed_hosts=list(settings.ALLOWED_HOSTS_TUPLE),
+        allowed_origins=list(settings.ALLOWED_ORIGINS_TUPLE),
     ),
 )
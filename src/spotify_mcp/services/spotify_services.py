@@ -1,22 +1,373 @@
-from typing import Dict, Optional
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
 import httpx
+import orjson
 
+from src.common.exceptions import AppException
 from src.common.responses import AppResponse
+from src.common.ttl_store import TTLDict
 from src.core.config import settings
-from src.spotify_mcp.utils.decorators import with_spotify_token
+from src.core.http import get_http_client
+from src.spotify_mcp.utils.decorators import TOOL_LIMITER, mark_token_stale, with_spotify_token
+
+
+# Spotify's maximum page size for /me/tracks and /me/playlists
+_PAGE_SIZE = 50
+
+# Pages of one collection fetched at once; a large library would otherwise
+# fire hundreds of requests together and trip Spotify's rate limit
+_PAGE_CONCURRENCY = 8
+
+# Success codes for player commands (PUT/POST with no body of interest)
+_OK_WRITE = frozenset({200, 204})
+
+# Success envelopes for commands that return no data. AppResponse is frozen,
+# so one shared instance per outcome is safe.
+_OK_PLAY = AppResponse(status=True, message="Playback started", data=None)
+_OK_PAUSE = AppResponse(status=True, message="Playback paused", data=None)
+_OK_NEXT = AppResponse(status=True, message="Skipped to next track", data=None)
+_OK_PREVIOUS = AppResponse(status=True, message="Skipped to previous track", data=None)
+_OK_TRANSFER = AppResponse(status=True, message="Playback transferred", data=None)
+
+# Types accepted by /search; checked locally so a typo costs no round trip
+_SEARCH_TYPES = frozenset(
+    {"album", "artist", "playlist", "track", "show", "episode", "audiobook"}
+)
+
+# Endpoint URLs, built once at import instead of per call
+_URL_PLAYER = settings.SPOTIFY_BASE_URL + "/me/player"
+_URL_DEVICES = settings.SPOTIFY_BASE_URL + "/me/player/devices"
+_URL_NEXT = settings.SPOTIFY_BASE_URL + "/me/player/next"
+_URL_PAUSE = settings.SPOTIFY_BASE_URL + "/me/player/pause"
+_URL_PLAY = settings.SPOTIFY_BASE_URL + "/me/player/play"
+_URL_PREVIOUS = settings.SPOTIFY_BASE_URL + "/me/player/previous"
+_URL_VOLUME = settings.SPOTIFY_BASE_URL + "/me/player/volume"
+_URL_MY_PLAYLISTS = settings.SPOTIFY_BASE_URL + "/me/playlists"
+_URL_MY_TRACKS = settings.SPOTIFY_BASE_URL + "/me/tracks"
+_URL_SEARCH = settings.SPOTIFY_BASE_URL + "/search"
+
+# Last ETag and decoded body per (url, params, user) for conditional GETs
+_ETAG_CACHE_MAX = 256
+_etag_cache: "OrderedDict[tuple, Tuple[str, Any]]" = OrderedDict()
+
+# Decoded bodies served without any request for a few seconds per
+# (url, params, user). Player commands drop the user's /me/player entry.
+_RESPONSE_CACHE_MAX = 512
+_response_cache: "OrderedDict[tuple, Tuple[float, Any]]" = OrderedDict()
+
+# Player commands running in the background (SPOTIFY_ASYNC_COMMANDS), held
+# so they aren't garbage collected mid-flight, and the last failure of one
+# per user, reported by that user's next command. Failures are keyed by the
+# Spotify access token, so they expire with it; the lifespan sweeps them.
+_background_commands: "set[asyncio.Future]" = set()
+_DEFERRED_FAILURE_TTL = 3600  # Spotify access token lifetime
+DEFERRED_FAILURES = TTLDict()
+
+# Fetches currently running for a cache key, shared by concurrent callers
+_inflight: "Dict[tuple, asyncio.Future]" = {}
+
+# /me/player snapshot lifetime: long enough for get_current_playback and
+# get_volume in the same agent turn to share one round trip
+_PLAYER_STATE_TTL = 2.0
+
+# Read-mostly endpoints agents re-query across consecutive tool calls
+_DEVICES_TTL = 5.0
+_LIBRARY_TTL = 60.0
+_SEARCH_TTL = 300.0
+
+
+def _parse(response: httpx.Response) -> Any:
+    """Decode a Spotify JSON body with orjson instead of the stdlib json."""
+    return orjson.loads(response.content)
+
+
+def _failure(action: str, response: httpx.Response) -> AppResponse:
+    """Standard failure envelope carrying Spotify's error body."""
+    if response.status_code == 401:
+        mark_token_stale(response.request.headers["Authorization"])
+    return AppResponse(
+        status=False,
+        message=f"{action} failed: {response.text}",
+        data=None,
+    )
+
+
+def _project(
+    items: List[Dict[str, Any]],
+    slim: Callable[[Dict[str, Any]], Dict[str, Any]],
+    full: bool,
+) -> List[Dict[str, Any]]:
+    # slim builds new dicts, so the cached response body is never touched
+    return items if full else [slim(item) for item in items]
+
+
+def _slim_track(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Saved-track item reduced to what agents use (drops markets, art, ids)."""
+    track = item.get("track") or {}
+    artists = track.get("artists") or [{}]
+    return {
+        "uri": track.get("uri"),
+        "name": track.get("name"),
+        "artist": artists[0].get("name"),
+    }
+
+
+def _slim_playlist(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Playlist item reduced to what agents use."""
+    return {
+        "uri": item.get("uri"),
+        "name": item.get("name"),
+        "owner": (item.get("owner") or {}).get("display_name"),
+    }
+
+
+async def _conditional_get(
+    url: str,
+    headers: Dict[str, str],
+    params: Optional[Dict[str, Any]] = None,
+) -> Tuple[httpx.Response, Any]:
+    """
+    GET a Spotify resource with If-None-Match.
+
+    When Spotify answers 304 Not Modified the previously decoded body is
+    reused, so the payload is neither transferred nor parsed again.
+
+    Returns:
+        (response, body) where body is None if the request failed.
+    """
+    key = (url, tuple(sorted((params or {}).items())), headers.get("Authorization"))
+    cached = _etag_cache.get(key)
+
+    request_headers = headers
+    if cached is not None:
+        request_headers = {**headers, "If-None-Match": cached[0]}
+
+    client = get_http_client()
+    response = await client.get(url, headers=request_headers, params=params)
+
+    if response.status_code == 304 and cached is not None:
+        _etag_cache.move_to_end(key)
+        return response, cached[1]
+
+    if response.status_code != 200:
+        return response, None
+
+    body = _parse(response)
+
+    etag = response.headers.get("ETag")
+    if etag:
+        _etag_cache[key] = (etag, body)
+        _etag_cache.move_to_end(key)
+        if len(_etag_cache) > _ETAG_CACHE_MAX:
+            _etag_cache.popitem(last=False)
+
+    return response, body
+
+
+def _cache_key(url: str, headers: Dict[str, str], params: Optional[Dict[str, Any]]) -> tuple:
+    return (url, tuple(sorted((params or {}).items())), headers.get("Authorization"))
+
+
+async def _cached_get(
+    url: str,
+    headers: Dict[str, str],
+    ttl: float,
+    params: Optional[Dict[str, Any]] = None,
+) -> Tuple[Optional[httpx.Response], Any]:
+    """
+    GET through a short TTL cache of decoded bodies.
+
+    A fresh hit skips Spotify entirely. On a miss, concurrent callers asking
+    for the same key share one in-flight _conditional_get instead of each
+    sending it. Only successful bodies are cached.
+
+    Returns:
+        (response, body) where response is None on a cache hit and body is
+        None if the request failed.
+    """
+    key = _cache_key(url, headers, params)
+    cached = _response_cache.get(key)
+    if cached is not None:
+        if cached[0] > time.monotonic():
+            _response_cache.move_to_end(key)
+            return None, cached[1]
+        del _response_cache[key]
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_and_cache(key, url, headers, ttl, params))
+        _inflight[key] = task
+        task.add_done_callback(lambda done: _forget_inflight(key, done))
+
+    # shield: a cancelled caller must not cancel the fetch others await
+    return await asyncio.shield(task)
+
+
+def _forget_inflight(key: tuple, task: asyncio.Future) -> None:
+    # an invalidation may already have replaced or dropped the entry
+    if _inflight.get(key) is task:
+        del _inflight[key]
+
+
+async def _fetch_and_cache(
+    key: tuple,
+    url: str,
+    headers: Dict[str, str],
+    ttl: float,
+    params: Optional[Dict[str, Any]],
+) -> Tuple[httpx.Response, Any]:
+    response, body = await _conditional_get(url, headers, params)
+
+    # Skip the store if the key was invalidated while this was in flight
+    if body is not None and _inflight.get(key) is asyncio.current_task():
+        _response_cache[key] = (time.monotonic() + ttl, body)
+        if len(_response_cache) > _RESPONSE_CACHE_MAX:
+            _response_cache.popitem(last=False)
+
+    return response, body
+
+
+def _invalidate_player_state(headers: Dict[str, str], devices: bool = False) -> None:
+    """
+    Forget the cached /me/player snapshot after a player command.
+
+    devices=True also drops the device list, whose is_active flags change
+    when playback moves.
+    """
+    urls = (_URL_PLAYER, _URL_DEVICES) if devices else (_URL_PLAYER,)
+    for url in urls:
+        key = _cache_key(url, headers, None)
+        _response_cache.pop(key, None)
+        _inflight.pop(key, None)
+
+
+async def _send_command(
+    method: str,
+    url: str,
+    headers: Dict[str, str],
+    action: str,
+    ok: AppResponse,
+    params: Optional[Dict[str, Any]] = None,
+) -> AppResponse:
+    """Send a bodiless player command and map the outcome to an envelope."""
+    client = get_http_client()
+    response = await client.request(method, url, headers=headers, params=params)
 
+    if response.status_code not in _OK_WRITE:
+        return _failure(action, response)
 
-# Shared helper: one client per request (simple & safe)
-def _client() -> httpx.AsyncClient:
-    return httpx.AsyncClient(timeout=10.0)
+    _invalidate_player_state(headers)
+    return ok
+
+
+async def _player_command(
+    method: str,
+    url: str,
+    headers: Dict[str, str],
+    action: str,
+    ok: AppResponse,
+    params: Optional[Dict[str, Any]] = None,
+) -> AppResponse:
+    """
+    Run a player command, or queue it when SPOTIFY_ASYNC_COMMANDS is set.
+
+    Queued commands return ok straight away. If one later fails, the user's
+    next command is not sent: it fails with a message naming it and the
+    earlier failure, so an agent never builds on a state change that
+    didn't happen.
+    """
+    if not settings.SPOTIFY_ASYNC_COMMANDS:
+        return await _send_command(method, url, headers, action, ok, params)
+
+    user = headers["Authorization"]
+    failed = DEFERRED_FAILURES.pop(user, None)
+    if failed is not None:
+        return AppResponse(
+            status=False,
+            message=f"{action} not sent: an earlier command failed ({failed.message})",
+            data=None,
+        )
+
+    async def run() -> None:
+        # The caller's limiter slot is released once it returns, so the
+        # command holds one of its own until Spotify answers.
+        try:
+            async with TOOL_LIMITER.acquire(user):
+                result = await _send_command(method, url, headers, action, ok, params)
+        except AppException as exc:
+            result = AppResponse(status=False, message=f"{action} failed: {exc.message}", data=None)
+        except Exception as exc:
+            # timeouts and connection errors would otherwise vanish with the task
+            result = AppResponse(status=False, message=f"{action} failed: {exc!r}", data=None)
+
+        if not result.status:
+            DEFERRED_FAILURES.set(user, result, _DEFERRED_FAILURE_TTL)
+
+    task = asyncio.ensure_future(run())
+    _background_commands.add(task)
+    task.add_done_callback(_background_commands.discard)
+    return ok
+
+
+async def _fetch_all_pages(
+    url: str,
+    headers: Dict[str, str],
+) -> tuple[list, Optional[httpx.Response]]:
+    """
+    Fetch every item of a paged Spotify collection.
+
+    The first page reveals `total`; the remaining pages are then requested
+    concurrently, at most _PAGE_CONCURRENCY at a time, instead of one
+    round-trip after another. Each page is
+    decoded as soon as it arrives and only its items are kept, so parsing
+    overlaps the downloads still in flight and raw bodies are not held
+    until the last page lands.
+
+    Returns:
+        (items, None) on success, or ([], failed_response) if any page fails.
+    """
+    client = get_http_client()
+    slots = asyncio.Semaphore(_PAGE_CONCURRENCY)
+
+    async def fetch_page(offset: int) -> tuple[Optional[dict], Optional[httpx.Response]]:
+        async with slots:
+            response = await client.get(
+                url,
+                headers=headers,
+                params={"limit": _PAGE_SIZE, "offset": offset},
+            )
+        if response.status_code != 200:
+            return None, response
+        return _parse(response), None
+
+    body, failed = await fetch_page(0)
+    if failed is not None:
+        return [], failed
+
+    items = body.get("items", [])
+    total = body.get("total", len(items))
+
+    pages = await asyncio.gather(*(
+        fetch_page(offset)
+        for offset in range(_PAGE_SIZE, total, _PAGE_SIZE)
+    ))
+
+    for page, failed in pages:
+        if failed is not None:
+            return [], failed
+        items.extend(page.get("items", []))
+
+    return items, None
 
 
 # -------------------------
 # PLAYBACK CONTROLS
 # -------------------------
 
-@with_spotify_token
-async def play(
+async def _play(
     headers: Dict[str, str],
     context_uri: Optional[str] = None,
     uris: Optional[list[str]] = None,
@@ -24,6 +375,9 @@ async def play(
     """
     Start or resume playback.
     Supports either a context (playlist/album/artist) or explicit track URIs.
+
+    Undecorated so the play_* helpers below, which already hold headers,
+    don't resolve and verify the caller's token a second time.
     """
     payload = {}
 
@@ -33,122 +387,60 @@ async def play(
     if uris:
         payload["uris"] = uris
 
-    async with _client() as client:
-        response = await client.put(
-            f"{settings.SPOTIFY_BASE_URL}/me/player/play",
-            headers=headers,
-            json=payload if payload else None,
-        )
+    client = get_http_client()
+    response = await client.put(
+        _URL_PLAY,
+        headers=headers,
+        json=payload if payload else None,
+    )
 
-    if response.status_code not in (200, 204):
-        return AppResponse(
-            status=False,
-            message=f"Play failed: {response.text}",
-            data=None,
-        )
+    if response.status_code not in _OK_WRITE:
+        return _failure("Play", response)
 
-    return AppResponse(
-        status=True,
-        message="Playback started",
-        data=None,
-    )
+    _invalidate_player_state(headers)
+
+    return _OK_PLAY
+
+
+play = with_spotify_token(_play)
 
 
 @with_spotify_token
 async def pause(headers: Dict[str, str]) -> AppResponse:
     """Pause current playback."""
-    async with _client() as client:
-        response = await client.put(
-            f"{settings.SPOTIFY_BASE_URL}/me/player/pause",
-            headers=headers,
-        )
-
-    if response.status_code not in (200, 204):
-        return AppResponse(
-            status=False,
-            message=f"Pause failed: {response.text}",
-            data=None,
-        )
-
-    return AppResponse(
-        status=True,
-        message="Playback paused",
-        data=None,
-    )
+    return await _player_command("PUT", _URL_PAUSE, headers, "Pause", _OK_PAUSE)
 
 
 @with_spotify_token
 async def resume(headers: Dict[str, str]) -> AppResponse:
     """Alias for play() without context."""
-    return await play(headers=headers)
+    return await _play(headers)
 
 
 @with_spotify_token
 async def next_track(headers: Dict[str, str]) -> AppResponse:
     """Skip to next track."""
-    async with _client() as client:
-        response = await client.post(
-            f"{settings.SPOTIFY_BASE_URL}/me/player/next",
-            headers=headers,
-        )
-
-    if response.status_code not in (200, 204):
-        return AppResponse(
-            status=False,
-            message=f"Next track failed: {response.text}",
-            data=None,
-        )
-
-    return AppResponse(
-        status=True,
-        message="Skipped to next track",
-        data=None,
-    )
+    return await _player_command("POST", _URL_NEXT, headers, "Next track", _OK_NEXT)
 
 
 @with_spotify_token
 async def previous_track(headers: Dict[str, str]) -> AppResponse:
     """Skip to previous track."""
-    async with _client() as client:
-        response = await client.post(
-            f"{settings.SPOTIFY_BASE_URL}/me/player/previous",
-            headers=headers,
-        )
-
-    if response.status_code not in (200, 204):
-        return AppResponse(
-            status=False,
-            message=f"Previous track failed: {response.text}",
-            data=None,
-        )
-
-    return AppResponse(
-        status=True,
-        message="Skipped to previous track",
-        data=None,
-    )
+    return await _player_command("POST", _URL_PREVIOUS, headers, "Previous track", _OK_PREVIOUS)
 
 
 @with_spotify_token
 async def get_current_playback(headers: Dict[str, str]) -> AppResponse:
     """Fetch current playback state."""
-    async with _client() as client:
-        response = await client.get(
-            f"{settings.SPOTIFY_BASE_URL}/me/player",
-            headers=headers,
-        )
+    response, body = await _cached_get(_URL_PLAYER, headers, _PLAYER_STATE_TTL)
 
-    if response.status_code != 200:
-        return AppResponse(
-            status=False,
-            message=f"Playback fetch failed: {response.text}",
-            data=None,
-        )
+    if body is None:
+        return _failure("Playback fetch", response)
 
     return AppResponse(
         status=True,
         message="Playback state fetched",
-        data=response.json(),
+        data=body,
     )
 
 
@@ -164,44 +456,26 @@ async def set_volume(headers: Dict[str, str], volume: int) -> AppResponse:
     """
     volume = max(0, min(volume, 100))
 
-    async with _client() as client:
-        response = await client.put(
-            f"{settings.SPOTIFY_BASE_URL}/me/player/volume",
-            headers=headers,
-            params={"volume_percent": volume},
-        )
-
-    if response.status_code not in (200, 204):
-        return AppResponse(
-            status=False,
-            message=f"Set volume failed: {response.text}",
-            data=None,
-        )
-
-    return AppResponse(
-        status=True,
-        message="Volume updated",
-        data={"volume": volume},
+    return await _player_command(
+        "PUT",
+        _URL_VOLUME,
+        headers,
+        "Set volume",
+        AppResponse(status=True, message="Volume updated", data={"volume": volume}),
+        params={"volume_percent": volume},
     )
 
 
 @with_spotify_token
 async def get_volume(headers: Dict[str, str]) -> AppResponse:
     """Get current device volume."""
-    async with _client() as client:
-        response = await client.get(
-            f"{settings.SPOTIFY_BASE_URL}/me/player",
-            headers=headers,
-        )
+    # Same /me/player document as get_current_playback, so they share it
+    response, body = await _cached_get(_URL_PLAYER, headers, _PLAYER_STATE_TTL)
 
-    if response.status_code != 200:
-        return AppResponse(
-            status=False,
-            message=f"Volume fetch failed: {response.text}",
-            data=None,
-        )
+    if body is None:
+        return _failure("Volume fetch", response)
 
-    device = response.json().get("device")
+    device = body.get("device")
 
     return AppResponse(
         status=True,
@@ -222,55 +496,57 @@ async def search(
     limit: int = 10,
 ) -> AppResponse:
     """Search Spotify for tracks, artists, albums, or playlists."""
+    # Spotify accepts a comma-separated list of types; "track, artist" is
+    # tolerated and sent upstream as "track,artist"
+    types = [t for t in (part.strip() for part in search_type.split(",")) if t]
+    invalid = [t for t in types if t not in _SEARCH_TYPES]
+    if invalid or not types:
+        return AppResponse(
+            status=False,
+            message=f"Invalid search_type: {', '.join(invalid) or search_type!r}",
+            data=None,
+        )
+
     params = {
         "q": query,
-        "type": search_type,
+        "type": ",".join(types),
         "limit": limit,
     }
 
-    async with _client() as client:
-        response = await client.get(
-            f"{settings.SPOTIFY_BASE_URL}/search",
-            headers=headers,
-            params=params,
-        )
+    response, body = await _cached_get(_URL_SEARCH, headers, _SEARCH_TTL, params)
 
-    if response.status_code != 200:
-        return AppResponse(
-            status=False,
-            message=f"Search failed: {response.text}",
-            data=None,
-        )
+    if body is None:
+        return _failure("Search", response)
 
     return AppResponse(
         status=True,
         message="Search results fetched",
-        data=response.json(),
+        data=body,
     )
 
 
 @with_spotify_token
 async def play_track(headers: Dict[str, str], track_uri: str) -> AppResponse:
     """Play a single track by URI."""
-    return await play(headers=headers, uris=[track_uri])
+    return await _play(headers, uris=[track_uri])
 
 
 @with_spotify_token
 async def play_playlist(headers: Dict[str, str], playlist_uri: str) -> AppResponse:
     """Play a playlist by URI."""
-    return await play(headers=headers, context_uri=playlist_uri)
+    return await _play(headers, context_uri=playlist_uri)
 
 
 @with_spotify_token
 async def play_album(headers: Dict[str, str], album_uri: str) -> AppResponse:
     """Play an album by URI."""
-    return await play(headers=headers, context_uri=album_uri)
+    return await _play(headers, context_uri=album_uri)
 
 
 @with_spotify_token
 async def play_artist(headers: Dict[str, str], artist_uri: str) -> AppResponse:
     """Start artist radio via context URI."""
-    return await play(headers=headers, context_uri=artist_uri)
+    return await _play(headers, context_uri=artist_uri)
 
 
 # -------------------------
@@ -278,50 +554,86 @@ async def play_artist(headers: Dict[str, str], artist_uri: str) -> AppResponse:
 # -------------------------
 
 @with_spotify_token
-async def get_liked_tracks(headers: Dict[str, str], limit: int = 20) -> AppResponse:
+async def get_liked_tracks(
+    headers: Dict[str, str],
+    limit: int = 20,
+    full: bool = False,
+) -> AppResponse:
     """Fetch user's liked (saved) tracks."""
-    async with _client() as client:
-        response = await client.get(
-            f"{settings.SPOTIFY_BASE_URL}/me/tracks",
-            headers=headers,
-            params={"limit": limit},
-        )
+    response, body = await _cached_get(
+        _URL_MY_TRACKS,
+        headers,
+        _LIBRARY_TTL,
+        params={"limit": limit},
+    )
 
-    if response.status_code != 200:
-        return AppResponse(
-            status=False,
-            message=f"Liked tracks fetch failed: {response.text}",
-            data=None,
-        )
+    if body is None:
+        return _failure("Liked tracks fetch", response)
 
     return AppResponse(
         status=True,
         message="Liked tracks fetched",
-        data=response.json().get("items", []),
+        data=_project(body.get("items", []), _slim_track, full),
     )
 
 
 @with_spotify_token
-async def get_user_playlists(headers: Dict[str, str], limit: int = 20) -> AppResponse:
+async def get_user_playlists(
+    headers: Dict[str, str],
+    limit: int = 20,
+    full: bool = False,
+) -> AppResponse:
     """Fetch user's playlists."""
-    async with _client() as client:
-        response = await client.get(
-            f"{settings.SPOTIFY_BASE_URL}/me/playlists",
-            headers=headers,
-            params={"limit": limit},
-        )
+    response, body = await _cached_get(
+        _URL_MY_PLAYLISTS,
+        headers,
+        _LIBRARY_TTL,
+        params={"limit": limit},
+    )
 
-    if response.status_code != 200:
-        return AppResponse(
-            status=False,
-            message=f"Playlists fetch failed: {response.text}",
-            data=None,
-        )
+    if body is None:
+        return _failure("Playlists fetch", response)
 
     return AppResponse(
         status=True,
         message="Playlists fetched",
-        data=response.json().get("items", []),
+        data=_project(body.get("items", []), _slim_playlist, full),
+    )
+
+
+@with_spotify_token
+async def get_all_liked_tracks(headers: Dict[str, str], full: bool = False) -> AppResponse:
+    """Fetch the user's entire liked (saved) tracks library."""
+    items, failed = await _fetch_all_pages(
+        _URL_MY_TRACKS,
+        headers,
+    )
+
+    if failed is not None:
+        return _failure("Liked tracks fetch", failed)
+
+    return AppResponse(
+        status=True,
+        message="Liked tracks fetched",
+        data=_project(items, _slim_track, full),
+    )
+
+
+@with_spotify_token
+async def get_all_user_playlists(headers: Dict[str, str], full: bool = False) -> AppResponse:
+    """Fetch all of the user's playlists."""
+    items, failed = await _fetch_all_pages(
+        _URL_MY_PLAYLISTS,
+        headers,
+    )
+
+    if failed is not None:
+        return _failure("Playlists fetch", failed)
+
+    return AppResponse(
+        status=True,
+        message="Playlists fetched",
+        data=_project(items, _slim_playlist, full),
     )
 
 
@@ -332,23 +644,15 @@ async def get_user_playlists(headers: Dict[str, str], limit: int = 20) -> AppRes
 @with_spotify_token
 async def get_devices(headers: Dict[str, str]) -> AppResponse:
     """List available Spotify playback devices."""
-    async with _client() as client:
-        response = await client.get(
-            f"{settings.SPOTIFY_BASE_URL}/me/player/devices",
-            headers=headers,
-        )
+    response, body = await _cached_get(_URL_DEVICES, headers, _DEVICES_TTL)
 
-    if response.status_code != 200:
-        return AppResponse(
-            status=False,
-            message=f"Devices fetch failed: {response.text}",
-            data=None,
-        )
+    if body is None:
+        return _failure("Devices fetch", response)
 
     return AppResponse(
         status=True,
         message="Devices fetched",
-        data=response.json().get("devices", []),
+        data=body.get("devices", []),
     )
 
 
@@ -367,22 +671,16 @@ async def transfer_playback(
         "play": play_immediately,
     }
 
-    async with _client() as client:
-        response = await client.put(
-            f"{settings.SPOTIFY_BASE_URL}/me/player",
-            headers=headers,
-            json=payload,
-        )
+    client = get_http_client()
+    response = await client.put(
+        _URL_PLAYER,
+        headers=headers,
+        json=payload,
+    )
 
-    if response.status_code not in (200, 204):
-        return AppResponse(
-            status=False,
-            message=f"Transfer playback failed: {response.text}",
-            data=None,
-        )
+    if response.status_code not in _OK_WRITE:
+        return _failure("Transfer playback", response)
 
-    return AppResponse(
-        status=True,
-        message="Playback transferred",
-        data=None,
-    )
+    _invalidate_player_state(headers, devices=True)
+
+    return _OK_TRANSFER
@@ -1,5 +1,9 @@
-from typing import Dict, Any
+from functools import lru_cache
 
+import orjson
+from mcp.types import TextContent
+
+from src.common.responses import AppResponse
 from src.spotify_mcp.server import mcp as spotify_mcp
 from src.spotify_mcp.services.spotify_services import (
     play,
@@ -17,16 +21,46 @@ from src.spotify_mcp.services.spotify_services import (
     play_artist,
     get_liked_tracks,
     get_user_playlists,
+    get_all_liked_tracks,
+    get_all_user_playlists,
     get_devices,
     transfer_playback,
 )
 
+
+def _to_content(response: AppResponse) -> TextContent:
+    """
+    Serialize a service response once, with orjson.
+
+    Tools are registered with structured_output=False and hand FastMCP a
+    ready TextContent, so the payload isn't validated into an output model,
+    dumped back to a dict and JSON-encoded again.
+    """
+    if response.status and response.data is None:
+        return _static_content(response.message)
+    return TextContent(type="text", text=orjson.dumps(response.to_dict()).decode())
+
+
+@lru_cache(maxsize=32)
+def _static_content(message: str) -> TextContent:
+    """
+    Content for a data-less success, built once per message.
+
+    Success messages are a small fixed set; failures embed Spotify's error
+    body and are never routed here.
+    """
+    return TextContent(
+        type="text",
+        text=orjson.dumps({"status": True, "message": message, "data": None}).decode(),
+    )
+
+
 # =========================
 # PLAYBACK TOOLS
 # =========================
 
-@spotify_mcp.tool()
-async def play_music() -> Dict[str, Any]:
+@spotify_mcp.tool(structured_output=False)
+async def play_music() -> TextContent:
     """
     Start or resume music playback on the user's active Spotify device.
 
@@ -35,7 +69,7 @@ async def play_music() -> Dict[str, Any]:
     - Agent decides to resume playback after a pause
 
     Returns:
-        Dict[str, Any]:
+        TextContent: JSON text of
             {
                 "status": bool,
                 "message": str,
@@ -43,11 +77,11 @@ async def play_music() -> Dict[str, Any]:
             }
     """
     response = await play()
-    return response.model_dump()
+    return _to_content(response)
 
 
-@spotify_mcp.tool()
-async def pause_music() -> Dict[str, Any]:
+@spotify_mcp.tool(structured_output=False)
+async def pause_music() -> TextContent:
     """
     Pause the currently playing track.
 
@@ -56,22 +90,22 @@ async def pause_music() -> Dict[str, Any]:
     - Agent wants silence without changing context
     """
     response = await pause()
-    return response.model_dump()
+    return _to_content(response)
 
 
-@spotify_mcp.tool()
-async def resume_music() -> Dict[str, Any]:
+@spotify_mcp.tool(structured_output=False)
+async def resume_music() -> TextContent:
     """
     Resume playback without changing the current context.
 
     Alias for play_music.
     """
     response = await resume()
-    return response.model_dump()
+    return _to_content(response)
 
 
-@spotify_mcp.tool()
-async def next_song() -> Dict[str, Any]:
+@spotify_mcp.tool(structured_output=False)
+async def next_song() -> TextContent:
     """
     Skip to the next track in the queue.
 
@@ -80,20 +114,20 @@ async def next_song() -> Dict[str, Any]:
     - Agent detects repeated skips or frustration
     """
     response = await next_track()
-    return response.model_dump()
+    return _to_content(response)
 
 
-@spotify_mcp.tool()
-async def previous_song() -> Dict[str, Any]:
+@spotify_mcp.tool(structured_output=False)
+async def previous_song() -> TextContent:
     """
     Go back to the previous track.
     """
     response = await previous_track()
-    return response.model_dump()
+    return _to_content(response)
 
 
-@spotify_mcp.tool()
-async def current_playback() -> Dict[str, Any]:
+@spotify_mcp.tool(structured_output=False)
+async def current_playback() -> TextContent:
     """
     Fetch the current playback state.
 
@@ -102,15 +136,15 @@ async def current_playback() -> Dict[str, Any]:
     - Verifying what is currently playing
     """
     response = await get_current_playback()
-    return response.model_dump()
+    return _to_content(response)
 
 
 # =========================
 # VOLUME TOOLS
 # =========================
 
-@spotify_mcp.tool()
-async def set_playback_volume(volume: int) -> Dict[str, Any]:
+@spotify_mcp.tool(structured_output=False)
+async def set_playback_volume(volume: int) -> TextContent:
     """
     Set playback volume (0–100).
 
@@ -122,11 +156,11 @@ async def set_playback_volume(volume: int) -> Dict[str, Any]:
     - User explicitly asks to change volume
     """
     response = await set_volume(volume=volume)
-    return response.model_dump()
+    return _to_content(response)
 
 
-@spotify_mcp.tool()
-async def get_playback_volume() -> Dict[str, Any]:
+@spotify_mcp.tool(structured_output=False)
+async def get_playback_volume() -> TextContent:
     """
     Get the current playback volume.
 
@@ -134,19 +168,19 @@ async def get_playback_volume() -> Dict[str, Any]:
     - Agent wants to make relative volume adjustments
     """
     response = await get_volume()
-    return response.model_dump()
+    return _to_content(response)
 
 
 # =========================
 # SEARCH & PLAY TOOLS
 # =========================
 
-@spotify_mcp.tool()
+@spotify_mcp.tool(structured_output=False)
 async def search_spotify(
     query: str,
     search_type: str = "track",
     limit: int = 10,
-) -> Dict[str, Any]:
+) -> TextContent:
     """
     Search Spotify for tracks, artists, albums, or playlists.
 
@@ -164,11 +198,11 @@ async def search_spotify(
         search_type=search_type,
         limit=limit,
     )
-    return response.model_dump()
+    return _to_content(response)
 
 
-@spotify_mcp.tool()
-async def play_song(track_uri: str) -> Dict[str, Any]:
+@spotify_mcp.tool(structured_output=False)
+async def play_song(track_uri: str) -> TextContent:
     """
     Play a specific track by Spotify URI.
 
@@ -179,74 +213,120 @@ async def play_song(track_uri: str) -> Dict[str, Any]:
         Exact track is already known.
     """
     response = await play_track(track_uri=track_uri)
-    return response.model_dump()
+    return _to_content(response)
 
 
-@spotify_mcp.tool()
-async def play_playlist_by_uri(playlist_uri: str) -> Dict[str, Any]:
+@spotify_mcp.tool(structured_output=False)
+async def play_playlist_by_uri(playlist_uri: str) -> TextContent:
     """
     Play a playlist by Spotify URI.
     """
     response = await play_playlist(playlist_uri=playlist_uri)
-    return response.model_dump()
+    return _to_content(response)
 
 
-@spotify_mcp.tool()
-async def play_album_by_uri(album_uri: str) -> Dict[str, Any]:
+@spotify_mcp.tool(structured_output=False)
+async def play_album_by_uri(album_uri: str) -> TextContent:
     """
     Play an album by Spotify URI.
     """
     response = await play_album(album_uri=album_uri)
-    return response.model_dump()
+    return _to_content(response)
 
 
-@spotify_mcp.tool()
-async def play_artist_radio(artist_uri: str) -> Dict[str, Any]:
+@spotify_mcp.tool(structured_output=False)
+async def play_artist_radio(artist_uri: str) -> TextContent:
     """
     Start playback using an artist context (radio-style).
     """
     response = await play_artist(artist_uri=artist_uri)
-    return response.model_dump()
+    return _to_content(response)
 
 
 # =========================
 # LIBRARY TOOLS
 # =========================
 
-@spotify_mcp.tool()
-async def liked_tracks(limit: int = 20) -> Dict[str, Any]:
+@spotify_mcp.tool(structured_output=False)
+async def liked_tracks(limit: int = 20, full: bool = False) -> TextContent:
     """
     Retrieve the user's liked (saved) tracks.
 
     Args:
         limit (int): Maximum number of tracks.
+        full (bool): Return Spotify's full saved-track objects instead of
+            the slim items below.
 
     Use when:
     - Agent wants to personalize playback
     - User asks for liked songs
+
+    Returns:
+        TextContent: JSON envelope whose data is a list of
+            {"uri": str, "name": str, "artist": str}
+        (first artist only), or Spotify's items as-is when full=True.
     """
-    response = await get_liked_tracks(limit=limit)
-    return response.model_dump()
+    response = await get_liked_tracks(limit=limit, full=full)
+    return _to_content(response)
 
 
-@spotify_mcp.tool()
-async def user_playlists(limit: int = 20) -> Dict[str, Any]:
+@spotify_mcp.tool(structured_output=False)
+async def user_playlists(limit: int = 20, full: bool = False) -> TextContent:
     """
     Retrieve the user's playlists.
 
     Args:
         limit (int): Maximum number of playlists.
+        full (bool): Return Spotify's full playlist objects instead of
+            the slim items below.
+
+    Returns:
+        TextContent: JSON envelope whose data is a list of
+            {"uri": str, "name": str, "owner": str}
+        (owner display name), or Spotify's items as-is when full=True.
+    """
+    response = await get_user_playlists(limit=limit, full=full)
+    return _to_content(response)
+
+
+@spotify_mcp.tool(structured_output=False)
+async def liked_tracks_all(full: bool = False) -> TextContent:
+    """
+    Retrieve the user's entire liked (saved) tracks library.
+
+    Args:
+        full (bool): Return Spotify's full saved-track objects instead of
+            {"uri", "name", "artist"} items, as liked_tracks.
+
+    Use when:
+    - Agent needs the full library rather than the most recent tracks
+    """
+    response = await get_all_liked_tracks(full=full)
+    return _to_content(response)
+
+
+@spotify_mcp.tool(structured_output=False)
+async def user_playlists_all(full: bool = False) -> TextContent:
+    """
+    Retrieve all of the user's playlists.
+
+    Args:
+        full (bool): Return Spotify's full playlist objects instead of
+            {"uri", "name", "owner"} items, as user_playlists.
+
+    Use when:
+    - The playlist the user asked for is not among the first page
     """
-    response = await get_user_playlists(limit=limit)
-    return response.model_dump()
+    response = await get_all_user_playlists(full=full)
+    return _to_content(response)
 
 
 # =========================
 # DEVICE TOOLS
 # =========================
 
-@spotify_mcp.tool()
-async def available_devices() -> Dict[str, Any]:
+@spotify_mcp.tool(structured_output=False)
+async def available_devices() -> TextContent:
     """
     List available Spotify playback devices.
 
@@ -255,14 +335,14 @@ async def available_devices() -> Dict[str, Any]:
     - Agent needs to switch devices
     """
     response = await get_devices()
-    return response.model_dump()
+    return _to_content(response)
 
 
-@spotify_mcp.tool()
+@spotify_mcp.tool(structured_output=False)
 async def switch_device(
     device_id: str,
     play_immediately: bool = True,
-) -> Dict[str, Any]:
+) -> TextContent:
     """
     Transfer playback to a specific device.
 
@@ -278,4 +358,4 @@ async def switch_device(
         device_id=device_id,
         play_immediately=play_immediately,
     )
-    return response.model_dump()
+    return _to_content(response)
@@ -1,79 +1,110 @@
-from functools import wraps
-from typing import Callable, Any, Dict
+from functools import lru_cache, wraps
+from typing import Callable, Any
 import inspect
 
+import httpx
 from mcp.server.auth.middleware.auth_context import get_access_token
 
 from src.common.exceptions import AppException
 from src.common.token import JWTService
+from src.common.ttl_store import TTLDict
+from src.core.config import settings
 from src.services.auth.auth_services import SPOTIFY_TOKENS
+from src.spotify_mcp.utils.limiter import PerUserLimiter
+
+
+# Stateless; shared by every wrapped tool call. Verified claims are memoised
+# inside JWTService until the token's exp, so repeat calls skip the HMAC.
+_JWT_SERVICE = JWTService()
+
+
+# Shared with background player commands, which take their own slot
+TOOL_LIMITER = PerUserLimiter(
+    concurrency=settings.TOOL_CONCURRENCY_PER_USER,
+    backlog=settings.TOOL_BACKLOG_PER_USER,
+)
+
+
+# Spotify access tokens Spotify has answered 401 for. Calls carrying one are
+# rejected locally until a refresh swaps in a new token (a new key), so a
+# dead session stops paying a round trip per tool call to relearn it.
+_STALE_TOKEN_TTL = 3600  # Spotify access token lifetime
+_stale_tokens = TTLDict()
+
+
+def mark_token_stale(authorization: str) -> None:
+    """Record that Spotify rejected this Authorization header value."""
+    _stale_tokens.purge_expired()
+    _stale_tokens.set(authorization, True, _STALE_TOKEN_TTL)
+
+
+@lru_cache(maxsize=1024)
+def _headers_for(access_token: str) -> httpx.Headers:
+    """
+    Spotify request headers for an access token, built once per token.
+
+    Built from raw bytes, so httpx copies the header list as-is on each
+    send instead of re-normalising and re-encoding a dict. A refreshed
+    Spotify token is a new key, so stale entries simply age out.
+    Callers must treat the returned headers as read-only.
+    """
+    return httpx.Headers([
+        (b"Authorization", b"Bearer " + access_token.encode("latin-1")),
+        (b"Content-Type", b"application/json"),
+    ])
+
+
+async def _spotify_headers() -> httpx.Headers:
+    """
+    Resolve the Spotify headers for the caller's internal access token.
+
+    Raises:
+        AppException: If the token no longer maps to stored Spotify tokens.
+    """
+    # Step 1: extract internal access token
+    token = get_access_token()
+
+    # Step 2: verify internal JWT
+    token_data = _JWT_SERVICE.verify_access_token(token.token)
+    token_id = token_data["token_id"]
+
+    stored_tokens = await SPOTIFY_TOKENS.get(token_id)
+    if not stored_tokens:
+        raise AppException(
+            message="Access token expired",
+            status_code=401,
+            headers={"WWW-Authenticate": 'Bearer error="invalid_token"'},
+        )
+
+    # Step 3: reuse the headers built for this Spotify access token
+    headers = _headers_for(stored_tokens["access_token"])
+
+    # Step 4: fail fast if Spotify already rejected this token
+    if headers["Authorization"] in _stale_tokens:
+        raise AppException(
+            message="Spotify session expired, please re-authorize this server",
+            status_code=401,
+            headers={"WWW-Authenticate": 'Bearer error="invalid_token"'},
+        )
+
+    return headers
 
 
 def with_spotify_token(func: Callable[..., Any]) -> Callable[..., Any]:
     """
     Injects Spotify Authorization headers using a verified internal access token.
 
-    Supports both sync and async wrapped functions.
+    Only async functions can be wrapped; the token lookup awaits the store.
     """
+    if not inspect.iscoroutinefunction(func):
+        # the token store is async, so there is no sync path to wrap
+        raise TypeError(f"with_spotify_token requires an async function: {func.__qualname__}")
 
+    @wraps(func)
     async def _async_wrapper(*args: Any, **kwargs: Any) -> Any:
-        # Step 1: extract internal access token
-        token = get_access_token()
-
-        # Step 2: verify internal JWT
-        jwt_service = JWTService()
-        token_data = jwt_service.verify_access_token(token.token)
-        token_id = token_data["token_id"]
-
-        stored_tokens = SPOTIFY_TOKENS.get(token_id)
-        if not stored_tokens:
-            raise AppException(
-                message="Access token expired",
-                status_code=401,
-                headers={"WWW-Authenticate": 'Bearer error="invalid_token"'},
-            )
-
-        # Step 3: extract Spotify access token
-        access_token = stored_tokens["access_token"]
-
-        headers: Dict[str, str] = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json",
-        }
-
-        # Call async function with injected headers
-        return await func(headers, *args, **kwargs)
-
-    def _sync_wrapper(*args: Any, **kwargs: Any) -> Any:
-        # Step 1: extract internal access token
-        token = get_access_token()
-
-        # Step 2: verify internal JWT
-        jwt_service = JWTService()
-        token_data = jwt_service.verify_access_token(token.token)
-        token_id = token_data["token_id"]
-
-        stored_tokens = SPOTIFY_TOKENS.get(token_id)
-        if not stored_tokens:
-            raise AppException(
-                message="Access token expired",
-                status_code=401,
-                headers={"WWW-Authenticate": 'Bearer error="invalid_token"'},
-            )
-
-        # Step 3: extract Spotify access token
-        access_token = stored_tokens["access_token"]
-
-        headers: Dict[str, str] = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json",
-        }
-
-        # Call sync function with injected headers
-        return func(headers, *args, **kwargs)
-
-    # Decide which wrapper to return based on function type
-    if inspect.iscoroutinefunction(func):
-        return wraps(func)(_async_wrapper)
-    else:
-        return wraps(func)(_sync_wrapper)
+        headers = await _spotify_headers()
+        # one queue per Spotify session, i.e. per signed-in user
+        async with TOOL_LIMITER.acquire(headers["Authorization"]):
+            return await func(headers, *args, **kwargs)
+
+    return _async_wrapper
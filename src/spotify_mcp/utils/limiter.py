@@ -0,0 +1,48 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List
+
+from src.common.exceptions import AppException
+
+
+class PerUserLimiter:
+    """
+    Caps concurrent tool calls per user.
+
+    Every user shares one event loop and one HTTP pool, so a single agent
+    firing a burst of calls could otherwise crowd everyone else out. Each
+    user runs at most `concurrency` calls at once; up to `backlog` more wait
+    their turn, and anything beyond that is rejected with a 429.
+    """
+
+    def __init__(self, concurrency: int, backlog: int) -> None:
+        if concurrency < 1 or backlog < 0:
+            raise ValueError("concurrency must be >= 1 and backlog >= 0")
+        self._concurrency = concurrency
+        self._limit = concurrency + backlog
+        # key -> [semaphore, running + waiting]; dropped when it reaches 0
+        self._slots: Dict[str, List] = {}
+
+    @asynccontextmanager
+    async def acquire(self, key: str) -> AsyncIterator[None]:
+        entry = self._slots.get(key)
+        # checked before an entry is created, so a rejected call never
+        # leaves one behind
+        if entry is not None and entry[1] >= self._limit:
+            raise AppException(
+                message="Too many concurrent requests",
+                status_code=429,
+                headers={"Retry-After": "1"},
+            )
+
+        if entry is None:
+            entry = self._slots[key] = [asyncio.Semaphore(self._concurrency), 0]
+
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._slots[key]